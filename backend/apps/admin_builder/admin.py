@@ -9,12 +9,25 @@ from .models import (
 class AdminBuilderConfigAdmin(admin.ModelAdmin):
     list_display = ['tenant', 'admin_name', 'theme', 'is_enabled']
     list_filter = ['theme', 'is_enabled']
+    list_select_related = ['tenant']
+    raw_id_fields = ['tenant']
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer('custom_css', 'custom_head_html')
 
 
 class WidgetInline(admin.TabularInline):
     model = Widget
     extra = 0
     fields = ['name', 'widget_type', 'is_visible']
+    show_change_link = True
+    
+    def get_queryset(self, request):
+        # Only the inline columns are rendered; config/style JSON is edited
+        # on the widget's own change form.
+        return super().get_queryset(request).only(
+            'id', 'page', 'name', 'widget_type', 'is_visible'
+        )
 
 
 @admin.register(AdminPage)
@@ -22,6 +35,8 @@ class AdminPageAdmin(admin.ModelAdmin):
     list_display = ['name', 'tenant', 'slug', 'page_type', 'is_published', 'nav_order']
     list_filter = ['page_type', 'is_published', 'show_in_nav']
     search_fields = ['name', 'title', 'slug']
+    list_select_related = ['tenant']
+    raw_id_fields = ['tenant', 'parent', 'data_source']
     prepopulated_fields = {'slug': ('name',)}
     inlines = [WidgetInline]
 
@@ -31,6 +46,8 @@ class WidgetAdmin(admin.ModelAdmin):
     list_display = ['name', 'page', 'widget_type', 'is_visible']
     list_filter = ['widget_type', 'is_visible']
     search_fields = ['name']
+    list_select_related = ['page', 'page__tenant']
+    raw_id_fields = ['page', 'data_source']
 
 
 @admin.register(DataSource)
@@ -38,6 +55,8 @@ class DataSourceAdmin(admin.ModelAdmin):
     list_display = ['name', 'tenant', 'source_type', 'cache_enabled']
     list_filter = ['source_type', 'cache_enabled']
     search_fields = ['name']
+    list_select_related = ['tenant']
+    raw_id_fields = ['tenant']
 
 
 @admin.register(AdminTemplate)
@@ -51,7 +70,12 @@ class AdminTemplateAdmin(admin.ModelAdmin):
 class ExportedAdminAdmin(admin.ModelAdmin):
     list_display = ['name', 'tenant', 'version', 'build_status', 'created_at']
     list_filter = ['build_status', 'framework']
+    list_select_related = ['tenant']
+    raw_id_fields = ['tenant']
     readonly_fields = ['build_log']
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer('code_blob', 'build_log')
 
 
 
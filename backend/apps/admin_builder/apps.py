@@ -5,12 +5,7 @@ class AdminBuilderConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.admin_builder'
     verbose_name = 'Admin Builder'
-
-
-
-
-
-
-
-
-
+    
+    def ready(self):
+        # Import signals to register them
+        import apps.admin_builder.signals  # noqa
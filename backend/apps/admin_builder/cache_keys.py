@@ -0,0 +1,18 @@
+"""
+Cache keys shared by the admin builder services, signals and tasks.
+
+Kept free of model and service imports so signals.py, which is loaded
+from AppConfig.ready(), doesn't pull the service layer into startup.
+"""
+import hashlib
+import json
+
+
+def config_cache_key(tenant_id) -> str:
+    return f"abcfg:{tenant_id}"
+
+
+def data_source_cache_key(ds, query: dict) -> str:
+    params = json.dumps(query, sort_keys=True, default=str)
+    digest = hashlib.md5(f"{ds.updated_at.isoformat()}:{params}".encode()).hexdigest()
+    return f"abds:{ds.tenant_id}:{ds.pk}:{digest}"
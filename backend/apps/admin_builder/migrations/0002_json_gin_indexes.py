@@ -0,0 +1,31 @@
+# Generated by Django 5.0 on 2026-10-18 09:32
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_builder', '0001_initial'),
+        ('tenants', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='admintemplate',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['pages'], name='admintemplate_pages_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='datasource',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['config'], name='datasource_config_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='widget',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['config'], name='widget_config_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='widget',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['data_query'], name='widget_data_query_gin'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.0 on 2026-10-18 09:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_builder', '0002_json_gin_indexes'),
+        ('tenants', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='adminpage',
+            index=models.Index(fields=['tenant', 'is_published', 'nav_order'], name='admin_build_tenant__494bed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='adminpage',
+            index=models.Index(fields=['tenant', 'show_in_nav', 'nav_order'], name='admin_build_tenant__3e3f5b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='widget',
+            index=models.Index(fields=['page', 'is_visible'], name='admin_build_page_id_52a4dc_idx'),
+        ),
+    ]
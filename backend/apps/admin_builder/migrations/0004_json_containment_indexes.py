@@ -0,0 +1,23 @@
+# Generated by Django 5.0 on 2026-10-18 09:37
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_builder', '0003_page_widget_composite_indexes'),
+        ('tenants', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='adminpage',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['allowed_roles'], name='adminpage_roles_gin', opclasses=['jsonb_path_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='widget',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['visibility_conditions'], name='widget_visibility_gin', opclasses=['jsonb_path_ops']),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.0 on 2026-10-18 09:42
+
+import json
+import zlib
+
+from django.db import migrations, models
+
+
+def compress_code(apps, schema_editor):
+    ExportedAdmin = apps.get_model('admin_builder', 'ExportedAdmin')
+    for export in ExportedAdmin.objects.only('id', 'code').iterator():
+        export.code_blob = zlib.compress(json.dumps(export.code or {}).encode(), 6)
+        export.save(update_fields=['code_blob'])
+
+
+def decompress_code(apps, schema_editor):
+    ExportedAdmin = apps.get_model('admin_builder', 'ExportedAdmin')
+    for export in ExportedAdmin.objects.only('id', 'code_blob').iterator():
+        blob = bytes(export.code_blob)
+        export.code = json.loads(zlib.decompress(blob)) if blob else {}
+        export.save(update_fields=['code'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_builder', '0005_admin_search_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exportedadmin',
+            name='code_blob',
+            field=models.BinaryField(default=bytes),
+        ),
+        migrations.RunPython(compress_code, decompress_code),
+        migrations.RemoveField(
+            model_name='exportedadmin',
+            name='code',
+        ),
+    ]
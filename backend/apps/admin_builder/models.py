@@ -1,5 +1,10 @@
 import uuid
+import zlib
+
+import orjson
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils import timezone
 
 
@@ -111,6 +116,23 @@ class AdminPage(models.Model):
     class Meta:
         ordering = ['nav_order', 'name']
         unique_together = [['tenant', 'slug']]
+        indexes = [
+            models.Index(fields=['tenant', 'is_published', 'nav_order']),
+            models.Index(fields=['tenant', 'show_in_nav', 'nav_order']),
+            # jsonb_path_ops only serves @> containment, e.g. allowed_roles__contains=['admin']
+            GinIndex(
+                fields=['allowed_roles'],
+                name='adminpage_roles_gin',
+                opclasses=['jsonb_path_ops'],
+            ),
+            # Admin search runs UPPER(col::text) LIKE UPPER('%term%')
+            GinIndex(
+                OpClass(Upper('name'), name='gin_trgm_ops'),
+                OpClass(Upper('title'), name='gin_trgm_ops'),
+                OpClass(Upper('slug'), name='gin_trgm_ops'),
+                name='adminpage_search_trgm',
+            ),
+        ]
     
     def __str__(self):
         return self.name
@@ -149,6 +171,8 @@ class Widget(models.Model):
         ('modal', 'Modal Trigger'),
         ('custom', 'Custom Component'),
     ]
+    # Hash lookups for validating bulk-created rows, which skip full_clean()
+    WIDGET_TYPE_VALUES = frozenset(value for value, _ in WIDGET_TYPES)
     
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     page = models.ForeignKey(
@@ -193,6 +217,20 @@ class Widget(models.Model):
     
     class Meta:
         ordering = ['name']
+        indexes = [
+            models.Index(fields=['page', 'is_visible']),
+            GinIndex(fields=['config'], name='widget_config_gin'),
+            GinIndex(fields=['data_query'], name='widget_data_query_gin'),
+            GinIndex(
+                fields=['visibility_conditions'],
+                name='widget_visibility_gin',
+                opclasses=['jsonb_path_ops'],
+            ),
+            GinIndex(
+                OpClass(Upper('name'), name='gin_trgm_ops'),
+                name='widget_search_trgm',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.widget_type})"
@@ -214,6 +252,7 @@ class DataSource(models.Model):
         ('analytics_events', 'Analytics Events'),
         ('custom', 'Custom Query'),
     ]
+    SOURCE_TYPE_VALUES = frozenset(value for value, _ in SOURCE_TYPES)
     
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     tenant = models.ForeignKey(
@@ -244,6 +283,9 @@ class DataSource(models.Model):
     
     class Meta:
         ordering = ['name']
+        indexes = [
+            GinIndex(fields=['config'], name='datasource_config_gin'),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.source_type})"
@@ -303,6 +345,9 @@ class AdminTemplate(models.Model):
     
     class Meta:
         ordering = ['category', 'name']
+        indexes = [
+            GinIndex(fields=['pages'], name='admintemplate_pages_gin'),
+        ]
     
     def __str__(self):
         return self.name
@@ -323,8 +368,8 @@ class ExportedAdmin(models.Model):
     name = models.CharField(max_length=100)
     version = models.CharField(max_length=20, default='1.0.0')
     
-    # Generated code
-    code = models.JSONField(default=dict)
+    # Generated code, zlib-compressed JSON; read and write it through `code`
+    code_blob = models.BinaryField(default=bytes)
     # { "files": { "App.tsx": "...", "pages/Dashboard.tsx": "..." } }
     
     # Build info
@@ -347,6 +392,34 @@ class ExportedAdmin(models.Model):
     
     def __str__(self):
         return f"{self.name} v{self.version}"
+    
+    @property
+    def code(self) -> dict:
+        if not self.code_blob:
+            return {}
+        return orjson.loads(zlib.decompress(self.code_blob))
+    
+    @code.setter
+    def code(self, value: dict):
+        self.code_blob = zlib.compress(orjson.dumps(value), 6)
+    
+    def iter_code_json(self, chunk_size: int = 64 * 1024):
+        """Yield the code as encoded JSON, decompressing at most `chunk_size` bytes at a time."""
+        if not self.code_blob:
+            yield b'{}'
+            return
+        blob = memoryview(self.code_blob)
+        decompressor = zlib.decompressobj()
+        for start in range(0, len(blob), chunk_size):
+            data = blob[start:start + chunk_size]
+            while data:
+                chunk = decompressor.decompress(data, chunk_size)
+                if chunk:
+                    yield chunk
+                data = decompressor.unconsumed_tail
+        tail = decompressor.flush()
+        if tail:
+            yield tail
 
 
 
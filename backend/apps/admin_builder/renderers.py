@@ -0,0 +1,23 @@
+"""
+Admin builder renderers.
+"""
+import orjson
+from rest_framework import renderers
+
+
+class ORJSONRenderer(renderers.BaseRenderer):
+    """
+    JSON renderer backed by orjson.
+
+    Page, widget and export payloads carry large nested JSON fields
+    (layout, config, style, code), where stdlib json encoding dominates.
+    """
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        # default=str covers lazy translation strings in error details
+        return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
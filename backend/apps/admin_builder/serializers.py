@@ -1,8 +1,14 @@
+import hashlib
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import orjson
 from rest_framework import serializers
 from .models import (
     AdminBuilderConfig, AdminPage, Widget, DataSource,
     AdminTemplate, ExportedAdmin
 )
+from .templates_library import get_all_templates, get_templates_by_category
 
 
 class AdminBuilderConfigSerializer(serializers.ModelSerializer):
@@ -18,6 +24,13 @@ class AdminBuilderConfigSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
+class AdminBuilderConfigMinimalSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AdminBuilderConfig
+        fields = ['id', 'admin_name', 'theme', 'is_enabled']
+        read_only_fields = fields
+
+
 class WidgetSerializer(serializers.ModelSerializer):
     class Meta:
         model = Widget
@@ -58,7 +71,8 @@ class AdminPageSerializer(serializers.ModelSerializer):
 
 
 class AdminPageListSerializer(serializers.ModelSerializer):
-    widget_count = serializers.SerializerMethodField()
+    # Annotated on the queryset with Count('widgets')
+    widget_count = serializers.IntegerField(read_only=True)
     
     class Meta:
         model = AdminPage
@@ -67,9 +81,18 @@ class AdminPageListSerializer(serializers.ModelSerializer):
             'page_type', 'show_in_nav', 'nav_order',
             'is_published', 'widget_count'
         ]
+
+
+class AdminPageNavSerializer(serializers.ModelSerializer):
+    # Annotated on the queryset with Exists() so no widgets are counted
+    has_widgets = serializers.BooleanField(read_only=True)
     
-    def get_widget_count(self, obj):
-        return obj.widgets.count()
+    class Meta:
+        model = AdminPage
+        fields = [
+            'id', 'name', 'slug', 'icon', 'parent',
+            'nav_order', 'is_published', 'has_widgets'
+        ]
 
 
 class AdminPageCreateSerializer(serializers.ModelSerializer):
@@ -115,6 +138,33 @@ class AdminTemplateSerializer(serializers.Serializer):
     is_premium = serializers.BooleanField(default=False)
 
 
+@lru_cache(maxsize=1)
+def get_template_catalog_bytes() -> Dict[str, bytes]:
+    """Encoded AdminTemplateSerializer payloads keyed by slug, built once per process."""
+    return {
+        t['slug']: orjson.dumps(AdminTemplateSerializer(t).data)
+        for t in get_all_templates()
+    }
+
+
+@lru_cache(maxsize=64)
+def get_template_detail_payload(slug: str) -> Optional[Tuple[bytes, str]]:
+    """Encoded template and its ETag, or None for an unknown slug."""
+    payload = get_template_catalog_bytes().get(slug)
+    if payload is None:
+        return None
+    return payload, f'"{hashlib.md5(payload).hexdigest()}"'
+
+
+@lru_cache(maxsize=32)
+def get_template_list_payload(category: str = None) -> Tuple[bytes, str]:
+    """Encoded template list for a category (or all) and its ETag, built once per process."""
+    templates = get_templates_by_category(category) if category else get_all_templates()
+    catalog = get_template_catalog_bytes()
+    payload = b'[' + b','.join(catalog[t['slug']] for t in templates) + b']'
+    return payload, f'"{hashlib.md5(payload).hexdigest()}"'
+
+
 class ApplyTemplateSerializer(serializers.Serializer):
     template_slug = serializers.CharField()
 
@@ -135,30 +185,89 @@ class ExportRequestSerializer(serializers.Serializer):
 
 
 # Widget type catalog
-WIDGET_TYPES = [
-    {'type': 'chart_bar', 'name': 'Bar Chart', 'icon': '📊', 'category': 'charts'},
-    {'type': 'chart_line', 'name': 'Line Chart', 'icon': '📈', 'category': 'charts'},
-    {'type': 'chart_pie', 'name': 'Pie Chart', 'icon': '🥧', 'category': 'charts'},
-    {'type': 'chart_area', 'name': 'Area Chart', 'icon': '📉', 'category': 'charts'},
-    {'type': 'stat_card', 'name': 'Stat Card', 'icon': '🔢', 'category': 'data'},
-    {'type': 'table', 'name': 'Data Table', 'icon': '📋', 'category': 'data'},
-    {'type': 'form', 'name': 'Form', 'icon': '📝', 'category': 'input'},
-    {'type': 'text', 'name': 'Text/HTML', 'icon': '📄', 'category': 'content'},
-    {'type': 'image', 'name': 'Image', 'icon': '🖼️', 'category': 'content'},
-    {'type': 'button', 'name': 'Button', 'icon': '🔘', 'category': 'input'},
-    {'type': 'card', 'name': 'Card', 'icon': '🃏', 'category': 'layout'},
-    {'type': 'list', 'name': 'List', 'icon': '📑', 'category': 'data'},
-    {'type': 'calendar', 'name': 'Calendar', 'icon': '📅', 'category': 'data'},
-    {'type': 'map', 'name': 'Map', 'icon': '🗺️', 'category': 'data'},
-    {'type': 'video', 'name': 'Video', 'icon': '🎬', 'category': 'content'},
-    {'type': 'iframe', 'name': 'IFrame', 'icon': '🌐', 'category': 'content'},
-    {'type': 'divider', 'name': 'Divider', 'icon': '➖', 'category': 'layout'},
-    {'type': 'spacer', 'name': 'Spacer', 'icon': '⬜', 'category': 'layout'},
-    {'type': 'tabs', 'name': 'Tabs', 'icon': '📂', 'category': 'layout'},
-    {'type': 'accordion', 'name': 'Accordion', 'icon': '📚', 'category': 'layout'},
-    {'type': 'modal', 'name': 'Modal Trigger', 'icon': '🪟', 'category': 'layout'},
-    {'type': 'custom', 'name': 'Custom Component', 'icon': '⚙️', 'category': 'advanced'},
-]
+class WidgetTypeDef(NamedTuple):
+    type: str
+    name: str
+    icon: str
+    category: str
+
+
+WIDGET_TYPES = tuple(WidgetTypeDef(*row) for row in (
+    ('chart_bar', 'Bar Chart', '📊', 'charts'),
+    ('chart_line', 'Line Chart', '📈', 'charts'),
+    ('chart_pie', 'Pie Chart', '🥧', 'charts'),
+    ('chart_area', 'Area Chart', '📉', 'charts'),
+    ('stat_card', 'Stat Card', '🔢', 'data'),
+    ('table', 'Data Table', '📋', 'data'),
+    ('form', 'Form', '📝', 'input'),
+    ('text', 'Text/HTML', '📄', 'content'),
+    ('image', 'Image', '🖼️', 'content'),
+    ('button', 'Button', '🔘', 'input'),
+    ('card', 'Card', '🃏', 'layout'),
+    ('list', 'List', '📑', 'data'),
+    ('calendar', 'Calendar', '📅', 'data'),
+    ('map', 'Map', '🗺️', 'data'),
+    ('video', 'Video', '🎬', 'content'),
+    ('iframe', 'IFrame', '🌐', 'content'),
+    ('divider', 'Divider', '➖', 'layout'),
+    ('spacer', 'Spacer', '⬜', 'layout'),
+    ('tabs', 'Tabs', '📂', 'layout'),
+    ('accordion', 'Accordion', '📚', 'layout'),
+    ('modal', 'Modal Trigger', '🪟', 'layout'),
+    ('custom', 'Custom Component', '⚙️', 'advanced'),
+))
+
+
+class DataSourceTypeDef(NamedTuple):
+    type: str
+    name: str
+    icon: str
+
+
+DATA_SOURCE_TYPES = tuple(DataSourceTypeDef(*row) for row in (
+    ('api', 'External API', '🌐'),
+    ('database', 'Database Collection', '🗄️'),
+    ('static', 'Static Data', '📦'),
+    ('checkout_orders', 'Orders', '📦'),
+    ('checkout_products', 'Products', '🏷️'),
+    ('cabinet_users', 'Users', '👥'),
+    ('cabinet_tickets', 'Support Tickets', '🎫'),
+    ('storage_files', 'Files', '📁'),
+    ('analytics_events', 'Analytics Events', '📈'),
+))
+
+
+class TemplateCategoryDef(NamedTuple):
+    slug: str
+    name: str
+    icon: str
+
+
+TEMPLATE_CATEGORIES = tuple(TemplateCategoryDef(*row) for row in (
+    ('dashboard', 'Dashboard', '📊'),
+    ('ecommerce', 'E-Commerce', '🛒'),
+    ('crm', 'CRM', '💼'),
+    ('cms', 'Content Management', '📝'),
+    ('analytics', 'Analytics', '📈'),
+    ('project', 'Project Management', '📋'),
+    ('hr', 'HR Management', '👔'),
+    ('finance', 'Finance', '💰'),
+    ('support', 'Support/Helpdesk', '🎫'),
+    ('social', 'Social Media', '📱'),
+))
+
+
+def _catalog_payload(rows: Tuple[NamedTuple, ...]) -> Tuple[bytes, str]:
+    """Encoded response body for a static catalog and its ETag."""
+    payload = orjson.dumps([row._asdict() for row in rows])
+    return payload, f'"{hashlib.md5(payload).hexdigest()}"'
+
+
+# The catalogs are static, so encode the response bodies once at import time
+WIDGET_TYPES_PAYLOAD = _catalog_payload(WIDGET_TYPES)
+DATA_SOURCE_TYPES_PAYLOAD = _catalog_payload(DATA_SOURCE_TYPES)
+TEMPLATE_CATEGORIES_PAYLOAD = _catalog_payload(TEMPLATE_CATEGORIES)
+
 
 
 
@@ -1,18 +1,175 @@
 """
 Admin builder services.
 """
+import json
 import logging
-from typing import List, Dict, Optional
-from django.db import transaction
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import List, Dict, Mapping, NamedTuple, Optional, Tuple
 
+import orjson
+import requests
+from django.apps import apps
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.db.models import Prefetch
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .cache_keys import config_cache_key, data_source_cache_key
 from .models import (
     AdminBuilderConfig, AdminPage, Widget, DataSource,
     AdminTemplate, ExportedAdmin
 )
-from .templates_library import get_all_templates, get_template
+from .templates_library import (
+    TemplateSpec, get_all_templates, get_template, get_template_spec,
+    get_templates_by_category, thaw
+)
 
 logger = logging.getLogger(__name__)
 
+# Shared keep-alive pool for 'api' data sources, so repeated fetches to the
+# same host skip the TCP/TLS handshake
+_http = requests.Session()
+# Fetches can run inline on a request thread, so retries stay cheap: failed
+# connects are retried, a read timeout never is, and a gateway error is
+# retried once for GETs only, without honouring a long Retry-After
+_http_retry = Retry(
+    total=2,
+    connect=2,
+    read=0,
+    status=1,
+    status_forcelist=(502, 503, 504),
+    allowed_methods=frozenset({'GET'}),
+    respect_retry_after_header=False,
+    raise_on_status=False,
+    backoff_factor=0.2,
+)
+_http_adapter = HTTPAdapter(pool_maxsize=16, max_retries=_http_retry)
+_http.mount('http://', _http_adapter)
+_http.mount('https://', _http_adapter)
+
+CONFIG_CACHE_TTL = 300
+
+DATA_SOURCE_DEFAULT_LIMIT = 100
+DATA_SOURCE_MAX_LIMIT = 1000
+DATA_SOURCE_FETCH_WORKERS = 8
+# How long a queued API fetch blocks another from being queued for the same key
+DATA_SOURCE_PENDING_TTL = 60
+
+
+class ModelSource(NamedTuple):
+    model: str
+    fields: tuple
+    # Read-only so the default can't be mutated through one registry entry
+    filters: Mapping = MappingProxyType({})
+    ordering: tuple = ()
+
+
+# Model-backed data source types; models resolve through the app registry
+# so this module doesn't import the other apps
+MODEL_SOURCES = {
+    'checkout_orders': ModelSource(
+        'checkout.Order',
+        ('id', 'order_number', 'customer_email', 'status', 'total_amount', 'created_at'),
+    ),
+    'checkout_products': ModelSource(
+        'checkout.Product',
+        ('id', 'name', 'price', 'sku', 'is_active', 'inventory_quantity'),
+    ),
+    'cabinet_users': ModelSource(
+        'cabinet.EndUser',
+        ('id', 'email', 'first_name', 'last_name', 'is_active', 'created_at'),
+    ),
+    'cabinet_tickets': ModelSource(
+        'cabinet.SupportTicket',
+        ('id', 'ticket_number', 'subject', 'status', 'priority', 'created_at'),
+    ),
+    'storage_files': ModelSource(
+        'storage.File',
+        ('id', 'original_name', 'content_type', 'file_size', 'created_at'),
+        filters={'is_deleted': False},
+    ),
+    'analytics_events': ModelSource(
+        'analytics.Event',
+        ('id', 'event_name', 'properties', 'timestamp'),
+        # Latest events first, served by the (tenant, timestamp) index
+        ordering=('-timestamp',),
+    ),
+}
+
+
+# Widget columns read when rendering pages; skips data_query and visibility JSON
+WIDGET_RENDER_FIELDS = ('id', 'page', 'name', 'widget_type', 'config', 'style')
+
+
+def _widgets_prefetch() -> Prefetch:
+    return Prefetch('widgets', queryset=Widget.objects.only(*WIDGET_RENDER_FIELDS))
+
+
+def _int_param(query: dict, name: str, default: int) -> int:
+    try:
+        return max(int(query.get(name, default)), 0)
+    except (TypeError, ValueError):
+        return default
+
+
+def _rows(qs, *fields) -> List[Dict]:
+    """Read a values() projection in chunks, skipping the queryset result cache."""
+    return list(qs.values(*fields).iterator(chunk_size=2000))
+
+
+def _apply_update(obj, data: dict):
+    """Set `data` on `obj` and write only those columns (plus updated_at)."""
+    if not data:
+        return obj
+    for field, value in data.items():
+        setattr(obj, field, value)
+    obj.save(update_fields=[*data, 'updated_at'])
+    return obj
+
+
+def _effective_limit(query: dict) -> int:
+    return min(_int_param(query, 'limit', DATA_SOURCE_DEFAULT_LIMIT), DATA_SOURCE_MAX_LIMIT)
+
+
+class DataSourceBatcher:
+    """
+    Shares data source fetches between the widgets rendered in one request.
+    
+    Requests for the same source whose queries differ only in `limit` run
+    once with the largest limit; model-backed results are then sliced back
+    down per widget.
+    """
+    
+    def __init__(self, service: 'AdminBuilderService'):
+        self.service = service
+        self._groups = {}
+    
+    def add(self, key: str, ds: DataSource, query: dict = None):
+        query = query or {}
+        shared = {k: v for k, v in query.items() if k != 'limit'}
+        group_key = (ds.pk, json.dumps(shared, sort_keys=True, default=str))
+        group = self._groups.setdefault(group_key, (ds, shared, []))
+        group[2].append((key, _effective_limit(query)))
+    
+    def run(self) -> Dict[str, Dict]:
+        groups = list(self._groups.values())
+        fetched = self.service.fetch_many([
+            (ds, {**shared, 'limit': max(member_limit for _, member_limit in members)})
+            for ds, shared, members in groups
+        ])
+        results = {}
+        for (ds, shared, members), result in zip(groups, fetched):
+            limit = max(member_limit for _, member_limit in members)
+            for key, member_limit in members:
+                if member_limit < limit and ds.source_type in MODEL_SOURCES:
+                    data = result['data'][:member_limit]
+                    results[key] = {**result, 'data': data, 'count': len(data)}
+                else:
+                    results[key] = result
+        return results
+
 
 class AdminBuilderService:
     """Service for admin panel building."""
@@ -24,9 +181,14 @@ class AdminBuilderService:
     @property
     def config(self) -> AdminBuilderConfig:
         if self._config is None:
-            self._config, _ = AdminBuilderConfig.objects.get_or_create(
-                tenant=self.tenant
-            )
+            # Shared across requests; signals.py drops the entry on save/delete
+            key = config_cache_key(self.tenant.pk)
+            self._config = cache.get(key)
+            if self._config is None:
+                self._config, _ = AdminBuilderConfig.objects.get_or_create(
+                    tenant=self.tenant
+                )
+                cache.set(key, self._config, CONFIG_CACHE_TTL)
         return self._config
     
     # ============= PAGES =============
@@ -36,12 +198,12 @@ class AdminBuilderService:
         qs = AdminPage.objects.filter(tenant=self.tenant)
         if published_only:
             qs = qs.filter(is_published=True)
-        return list(qs.prefetch_related('widgets'))
+        return list(qs.prefetch_related(_widgets_prefetch()))
     
     def get_page(self, page_id: str) -> Optional[AdminPage]:
         """Get a page by ID."""
         try:
-            return AdminPage.objects.prefetch_related('widgets').get(
+            return AdminPage.objects.prefetch_related(_widgets_prefetch()).get(
                 id=page_id,
                 tenant=self.tenant
             )
@@ -51,7 +213,7 @@ class AdminBuilderService:
     def get_page_by_slug(self, slug: str) -> Optional[AdminPage]:
         """Get a page by slug."""
         try:
-            return AdminPage.objects.prefetch_related('widgets').get(
+            return AdminPage.objects.prefetch_related(_widgets_prefetch()).get(
                 slug=slug,
                 tenant=self.tenant
             )
@@ -70,10 +232,7 @@ class AdminBuilderService:
     @transaction.atomic
     def update_page(self, page: AdminPage, data: dict) -> AdminPage:
         """Update a page."""
-        for field, value in data.items():
-            setattr(page, field, value)
-        page.save()
-        return page
+        return _apply_update(page, data)
     
     def delete_page(self, page: AdminPage) -> bool:
         """Delete a page."""
@@ -98,10 +257,7 @@ class AdminBuilderService:
     @transaction.atomic
     def update_widget(self, widget: Widget, data: dict) -> Widget:
         """Update a widget."""
-        for field, value in data.items():
-            setattr(widget, field, value)
-        widget.save()
-        return widget
+        return _apply_update(widget, data)
     
     def delete_widget(self, widget: Widget) -> bool:
         """Delete a widget."""
@@ -132,10 +288,7 @@ class AdminBuilderService:
     @transaction.atomic
     def update_data_source(self, ds: DataSource, data: dict) -> DataSource:
         """Update a data source."""
-        for field, value in data.items():
-            setattr(ds, field, value)
-        ds.save()
-        return ds
+        return _apply_update(ds, data)
     
     def delete_data_source(self, ds: DataSource) -> bool:
         """Delete a data source."""
@@ -143,67 +296,131 @@ class AdminBuilderService:
         return True
     
     def fetch_data_source(self, ds: DataSource, query: dict = None) -> Dict:
-        """Fetch data from a data source."""
-        from apps.checkout.models import Order, Product
-        from apps.cabinet.models import EndUser, SupportTicket
-        from apps.storage.models import File
-        from apps.analytics.models import Event
+        """
+        Fetch data from a data source.
         
-        source_type = ds.source_type
-        data = []
+        For model-backed sources `query` may carry `limit`, `offset`,
+        `order_by` (one of the returned fields, optionally prefixed with '-')
+        and `include_total`; paging is pushed down to the database.
         
-        if source_type == 'checkout_orders':
-            orders = Order.objects.filter(tenant=self.tenant)
-            data = list(orders.values('id', 'order_number', 'customer_email', 'status', 'total_amount', 'created_at'))
+        Results are cached for `cache_ttl_seconds` when `cache_enabled` is
+        set; the key includes `updated_at`, so editing the source
+        invalidates it.
+        """
+        query = query or {}
+        if ds.source_type == 'static':
+            return self._load_data_source(ds, query)
         
-        elif source_type == 'checkout_products':
-            products = Product.objects.filter(tenant=self.tenant)
-            data = list(products.values('id', 'name', 'price', 'sku', 'is_active', 'inventory_quantity'))
+        ttl = ds.cache_ttl_seconds if ds.cache_enabled else 0
+        key = data_source_cache_key(ds, query)
+        if ttl:
+            result = cache.get(key)
+            if result is not None:
+                return result
         
-        elif source_type == 'cabinet_users':
-            users = EndUser.objects.filter(tenant=self.tenant)
-            data = list(users.values('id', 'email', 'first_name', 'last_name', 'is_active', 'created_at'))
+        try:
+            result = self._load_data_source(ds, query)
+        except (requests.RequestException, orjson.JSONDecodeError) as e:
+            # Failures aren't cached so the next poll retries
+            logger.error(f"API data source fetch failed: {e}")
+            return {'data': [], 'count': 0}
         
-        elif source_type == 'cabinet_tickets':
-            tickets = SupportTicket.objects.filter(tenant=self.tenant)
-            data = list(tickets.values('id', 'ticket_number', 'subject', 'status', 'priority', 'created_at'))
+        if ttl:
+            cache.set(key, result, ttl)
+        return result
+    
+    def fetch_data_source_or_queue(self, ds: DataSource, query: dict = None) -> Optional[Dict]:
+        """
+        Like fetch_data_source, but a cache miss on a cached 'api' source
+        queues the fetch on Celery and returns None instead of waiting on the
+        external API; the caller polls until the result is cached.
+        """
+        query = query or {}
+        if ds.source_type != 'api' or not (ds.cache_enabled and ds.cache_ttl_seconds):
+            return self.fetch_data_source(ds, query)
         
-        elif source_type == 'storage_files':
-            files = File.objects.filter(tenant=self.tenant, is_deleted=False)
-            data = list(files.values('id', 'original_name', 'content_type', 'file_size', 'created_at'))
+        key = data_source_cache_key(ds, query)
+        result = cache.get(key)
+        if result is None and cache.add(f'{key}:pending', True, DATA_SOURCE_PENDING_TTL):
+            from .tasks import fetch_data_source_task
+            fetch_data_source_task.delay(str(ds.pk), query)
+        return result
+    
+    def _load_data_source(self, ds: DataSource, query: dict) -> Dict:
+        source_type = ds.source_type
+        data = []
         
-        elif source_type == 'analytics_events':
-            events = Event.objects.filter(tenant=self.tenant)[:1000]
-            data = list(events.values('id', 'event_name', 'properties', 'timestamp'))
+        source = MODEL_SOURCES.get(source_type)
+        if source is not None:
+            qs = apps.get_model(source.model).objects.filter(tenant=self.tenant, **source.filters)
+            if source.ordering:
+                qs = qs.order_by(*source.ordering)
+            return self._fetch_page(qs, source.fields, query)
         
-        elif source_type == 'static':
+        if source_type == 'static':
             data = ds.config.get('data', [])
         
         elif source_type == 'api':
-            import requests
-            try:
-                config = ds.config
-                response = requests.request(
-                    method=config.get('method', 'GET'),
-                    url=config.get('url'),
-                    headers=config.get('headers', {}),
-                    timeout=10
-                )
-                data = response.json()
-            except Exception as e:
-                logger.error(f"API data source fetch failed: {e}")
-                data = []
+            config = ds.config
+            response = _http.request(
+                method=config.get('method', 'GET'),
+                url=config.get('url'),
+                headers=config.get('headers', {}),
+                timeout=(2, 10)
+            )
+            data = orjson.loads(response.content)
         
         return {'data': data, 'count': len(data)}
     
+    def fetch_many(self, items: List[Tuple[DataSource, dict]]) -> List[Dict]:
+        """Fetch several data sources concurrently; results keep the input order."""
+        if len(items) <= 1:
+            return [self.fetch_data_source(ds, query) for ds, query in items]
+        workers = min(len(items), DATA_SOURCE_FETCH_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(self._fetch_in_worker, items))
+    
+    def _fetch_in_worker(self, item: Tuple[DataSource, dict]) -> Dict:
+        ds, query = item
+        try:
+            return self.fetch_data_source(ds, query)
+        finally:
+            # Worker threads get their own DB connections; don't leave them open
+            connections.close_all()
+    
+    def _fetch_page(self, qs, fields: tuple, query: dict) -> Dict:
+        """Apply ordering and LIMIT/OFFSET in SQL, counting the full set only on request."""
+        limit = _effective_limit(query)
+        offset = _int_param(query, 'offset', 0)
+        
+        order_by = query.get('order_by')
+        if order_by and order_by.lstrip('-') in fields:
+            qs = qs.order_by(order_by)
+        elif not qs.ordered:
+            # Stable pages need a deterministic order
+            qs = qs.order_by('pk')
+        
+        data = _rows(qs[offset:offset + limit], *fields)
+        result = {'data': data, 'count': len(data)}
+        if query.get('include_total') in (True, 'true', '1'):
+            result['total'] = qs.count()
+        return result
+    
+    def fetch_page_data(self, page: AdminPage) -> Dict[str, Dict]:
+        """Fetch data for every bound widget on a page, keyed by widget id."""
+        widgets = page.widgets.filter(data_source__isnull=False).select_related('data_source')
+        batcher = DataSourceBatcher(self)
+        for widget in widgets:
+            batcher.add(str(widget.pk), widget.data_source, widget.data_query)
+        return batcher.run()
+    
     # ============= TEMPLATES =============
     
-    def get_templates(self, category: str = None) -> List[Dict]:
+    def get_templates(self, category: str = None) -> Tuple[Dict, ...]:
         """Get available templates."""
-        templates = get_all_templates()
         if category:
-            templates = [t for t in templates if t['category'] == category]
-        return templates
+            return get_templates_by_category(category)
+        return get_all_templates()
     
     def get_template(self, slug: str) -> Optional[Dict]:
         """Get a specific template."""
@@ -212,64 +429,85 @@ class AdminBuilderService:
     @transaction.atomic
     def apply_template(self, template_slug: str) -> List[AdminPage]:
         """Apply a template to create pages."""
-        template = get_template(template_slug)
+        template = get_template_spec(template_slug)
         if not template:
             raise ValueError(f"Template '{template_slug}' not found")
-        
-        created_pages = []
+        self._validate_template(template)
         
         # Create data sources first
-        ds_map = {}
-        for ds_def in template.get('data_sources', []):
-            ds = DataSource.objects.create(
+        data_sources = DataSource.objects.bulk_create([
+            DataSource(
                 tenant=self.tenant,
-                name=ds_def['name'],
-                source_type=ds_def['source_type'],
-                config=ds_def.get('config', {})
+                name=ds_def.name,
+                source_type=ds_def.source_type,
+                config=thaw(ds_def.config)
             )
-            ds_map[ds_def['name']] = ds
+            for ds_def in template.data_sources
+        ])
+        ds_map = {ds.name: ds for ds in data_sources}
         
-        # Create pages
-        for page_def in template.get('pages', []):
-            page = AdminPage.objects.create(
+        # Then pages and their widgets, one batched INSERT per level
+        created_pages = []
+        widgets = []
+        for page_def in template.pages:
+            page = AdminPage(
                 tenant=self.tenant,
-                name=page_def['name'],
-                slug=page_def['slug'],
-                title=page_def['title'],
-                icon=page_def.get('icon', ''),
-                page_type=page_def.get('page_type', 'custom'),
-                nav_order=page_def.get('nav_order', 0),
-                layout=page_def.get('layout', {}),
-                data_source=ds_map.get(page_def.get('data_source'))
+                name=page_def.name,
+                slug=page_def.slug,
+                title=page_def.title,
+                icon=page_def.icon,
+                page_type=page_def.page_type,
+                nav_order=page_def.nav_order,
+                layout=thaw(page_def.layout),
+                data_source=ds_map.get(page_def.data_source)
             )
+            created_pages.append(page)
             
-            # Create widgets
-            for widget_def in page_def.get('widgets', []):
-                Widget.objects.create(
+            for widget_def in page_def.widgets:
+                widgets.append(Widget(
                     page=page,
-                    name=widget_def['name'],
-                    widget_type=widget_def['widget_type'],
-                    config=widget_def.get('config', {}),
-                    style=widget_def.get('style', {})
-                )
-            
-            created_pages.append(page)
+                    name=widget_def.name,
+                    widget_type=widget_def.widget_type,
+                    config=thaw(widget_def.config),
+                    style=thaw(widget_def.style)
+                ))
+        
+        AdminPage.objects.bulk_create(created_pages, batch_size=500)
+        Widget.objects.bulk_create(widgets, batch_size=1000)
         
         # Apply theme to config
-        theme = template.get('theme', {})
+        theme = template.theme
         if theme:
             self.config.primary_color = theme.get('primaryColor', self.config.primary_color)
             self.config.secondary_color = theme.get('secondaryColor', self.config.secondary_color)
-            self.config.save()
+            self.config.save(update_fields=['primary_color', 'secondary_color', 'updated_at'])
         
         return created_pages
     
+    def _validate_template(self, template: TemplateSpec):
+        """Check template choice values up front; model choices aren't validated on create."""
+        for ds_def in template.data_sources:
+            if ds_def.source_type not in DataSource.SOURCE_TYPE_VALUES:
+                raise ValueError(f"Unknown data source type '{ds_def.source_type}'")
+        
+        for page_def in template.pages:
+            for widget_def in page_def.widgets:
+                if widget_def.widget_type not in Widget.WIDGET_TYPE_VALUES:
+                    raise ValueError(f"Unknown widget type '{widget_def.widget_type}'")
+    
     # ============= EXPORT =============
     
     @transaction.atomic
     def export_to_react(self, name: str = None) -> ExportedAdmin:
         """Export the admin panel to React code."""
-        pages = self.get_pages(published_only=True)
+        # The generators only read these columns and never touch widgets
+        pages = list(
+            AdminPage.objects.filter(tenant=self.tenant, is_published=True)
+            .only('id', 'slug', 'icon', 'name', 'title', 'show_in_nav')
+        )
+        
+        # Component name per page, shared by every generator below
+        names = {p.id: p.slug.replace('-', '_').title() for p in pages}
         
         code = {
             'files': {},
@@ -277,12 +515,12 @@ class AdminBuilderService:
         }
         
         # Generate App.tsx
-        code['files']['App.tsx'] = self._generate_app_tsx(pages)
+        code['files']['App.tsx'] = self._generate_app_tsx(pages, names)
         
         # Generate pages
         for page in pages:
-            filename = f"pages/{page.slug.replace('-', '_').title()}.tsx"
-            code['files'][filename] = self._generate_page_tsx(page)
+            component = names[page.id]
+            code['files'][f"pages/{component}.tsx"] = self._generate_page_tsx(page, component)
         
         # Generate layout
         code['files']['Layout.tsx'] = self._generate_layout_tsx(pages)
@@ -308,16 +546,16 @@ class AdminBuilderService:
   }
 }'''
     
-    def _generate_app_tsx(self, pages: List[AdminPage]) -> str:
-        routes = '\n'.join([
-            f'        <Route path="/{p.slug}" element={{<{p.slug.replace("-", "_").title()} />}} />'
+    def _generate_app_tsx(self, pages: List[AdminPage], names: Dict) -> str:
+        routes = '\n'.join(
+            f'        <Route path="/{p.slug}" element={{<{names[p.id]} />}} />'
             for p in pages
-        ])
+        )
         
-        imports = '\n'.join([
-            f"import {p.slug.replace('-', '_').title()} from './pages/{p.slug.replace('-', '_').title()}';"
+        imports = '\n'.join(
+            f"import {names[p.id]} from './pages/{names[p.id]}';"
             for p in pages
-        ])
+        )
         
         return f'''import React from 'react';
 import {{ BrowserRouter, Routes, Route }} from 'react-router-dom';
@@ -340,10 +578,10 @@ export default App;
 '''
     
     def _generate_layout_tsx(self, pages: List[AdminPage]) -> str:
-        nav_items = '\n'.join([
+        nav_items = '\n'.join(
             f'        <NavLink to="/{p.slug}">{p.icon} {p.name}</NavLink>'
             for p in pages if p.show_in_nav
-        ])
+        )
         
         return f'''import React from 'react';
 import {{ NavLink }} from 'react-router-dom';
@@ -364,10 +602,10 @@ const Layout = ({{ children }}) => {{
 export default Layout;
 '''
     
-    def _generate_page_tsx(self, page: AdminPage) -> str:
+    def _generate_page_tsx(self, page: AdminPage, component: str) -> str:
         return f'''import React from 'react';
 
-const {page.slug.replace('-', '_').title()} = () => {{
+const {component} = () => {{
   return (
     <div className="page">
       <h1>{page.title}</h1>
@@ -376,7 +614,7 @@ const {page.slug.replace('-', '_').title()} = () => {{
   );
 }};
 
-export default {page.slug.replace('-', '_').title()};
+export default {component};
 '''
 
 
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.core.cache import cache
+
+from .models import AdminBuilderConfig
+from .cache_keys import config_cache_key
+
+
+@receiver([post_save, post_delete], sender=AdminBuilderConfig)
+def invalidate_config_cache(sender, instance, **kwargs):
+    """Drop the cached config so the next service lookup re-reads it."""
+    cache.delete(config_cache_key(instance.tenant_id))
@@ -0,0 +1,22 @@
+"""
+Celery tasks for the admin builder
+"""
+from celery import shared_task
+from django.core.cache import cache
+
+from .cache_keys import data_source_cache_key
+from .models import DataSource
+from .services import AdminBuilderService
+
+
+@shared_task
+def fetch_data_source_task(data_source_id: str, query: dict):
+    """Fetch an 'api' data source into the cache for fetch_data_source_or_queue."""
+    ds = DataSource.objects.select_related('tenant').filter(pk=data_source_id).first()
+    if ds is None:
+        return
+    try:
+        AdminBuilderService(ds.tenant).fetch_data_source(ds, query)
+    finally:
+        # Let the next poll queue a retry if the fetch failed
+        cache.delete(f'{data_source_cache_key(ds, query)}:pending')
@@ -0,0 +1,89 @@
+"""
+Tests for compressed ExportedAdmin code and its migration.
+
+Run: python manage.py test apps.admin_builder
+"""
+import zlib
+
+import orjson
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+
+from apps.admin_builder.models import ExportedAdmin
+
+CODE = {
+    'files': {
+        'App.tsx': 'export default function App() { return null; }\n' * 50,
+        'pages/Dashboard.tsx': 'export const Dashboard = () => <div>Dashboard</div>;\n' * 50,
+    }
+}
+
+
+class ExportedAdminCodeTest(TestCase):
+    """Test reading and writing code through the compressed blob."""
+
+    def setUp(self):
+        user = get_user_model().objects.create_user('owner', 'owner@example.com', 'password')
+        self.tenant = user.tenant_memberships.get().tenant
+
+    def test_code_round_trip(self):
+        """Code saved through `code` reads back unchanged and is stored compressed."""
+        export = ExportedAdmin(tenant=self.tenant, name='Admin')
+        export.code = CODE
+        export.save()
+
+        export = ExportedAdmin.objects.get(pk=export.pk)
+        self.assertEqual(export.code, CODE)
+        self.assertLess(len(export.code_blob), len(orjson.dumps(CODE)))
+
+    def test_iter_code_json(self):
+        """Streaming the code in small chunks yields the same JSON."""
+        export = ExportedAdmin(tenant=self.tenant, name='Admin')
+        export.code = CODE
+
+        chunks = list(export.iter_code_json(chunk_size=64))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(b''.join(chunks), orjson.dumps(CODE))
+
+    def test_empty_code(self):
+        """An export without code reads as an empty dict."""
+        export = ExportedAdmin.objects.create(tenant=self.tenant, name='Admin')
+
+        self.assertEqual(export.code, {})
+        self.assertEqual(b''.join(export.iter_code_json()), b'{}')
+
+
+class CompressExportedCodeMigrationTest(TransactionTestCase):
+    """Test migration 0006 moves existing code into the blob and back."""
+
+    before = [('admin_builder', '0005_admin_search_trigram_indexes')]
+    after = [('admin_builder', '0006_compress_exported_code')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        # Leave the schema fully migrated for the tests that follow
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_forwards_and_backwards(self):
+        old_apps = self.migrate(self.before)
+        user = get_user_model().objects.create_user('owner', 'owner@example.com', 'password')
+        tenant_id = user.tenant_memberships.get().tenant_id
+        export = old_apps.get_model('admin_builder', 'ExportedAdmin').objects.create(
+            tenant_id=tenant_id, name='Admin', code=CODE,
+        )
+
+        new_apps = self.migrate(self.after)
+        migrated = new_apps.get_model('admin_builder', 'ExportedAdmin').objects.get(pk=export.pk)
+        self.assertEqual(orjson.loads(zlib.decompress(bytes(migrated.code_blob))), CODE)
+
+        old_apps = self.migrate(self.before)
+        restored = old_apps.get_model('admin_builder', 'ExportedAdmin').objects.get(pk=export.pk)
+        self.assertEqual(restored.code, CODE)
@@ -0,0 +1,93 @@
+"""
+Query count tests for the admin changelists and the page endpoints.
+
+Run: python manage.py test apps.admin_builder
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.admin_builder.models import AdminPage, Widget
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def add_pages(tenant, count, widgets_per_page=2):
+    """Create `count` pages on `tenant`, each with a few widgets."""
+    pages = AdminPage.objects.bulk_create([
+        AdminPage(tenant=tenant, name=f'Page {i}', slug=f'page-{i}', title=f'Page {i}')
+        for i in range(AdminPage.objects.filter(tenant=tenant).count(), count)
+    ])
+    Widget.objects.bulk_create([
+        Widget(page=page, name=f'Widget {j}', widget_type='stat_card')
+        for page in pages
+        for j in range(widgets_per_page)
+    ])
+    return pages
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class AdminChangelistQueryTest(TestCase):
+    """The Django admin changelists don't issue a query per row."""
+
+    def setUp(self):
+        cache.clear()
+        User = get_user_model()
+        owner = User.objects.create_user('owner', 'owner@example.com', 'password')
+        self.tenant = owner.tenant_memberships.get().tenant
+        self.client.force_login(User.objects.create_superuser('root', 'root@example.com', 'password'))
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def assert_constant_queries(self, url):
+        add_pages(self.tenant, 2)
+        few = self.count_queries(url)
+        add_pages(self.tenant, 6)
+        self.assertEqual(self.count_queries(url), few)
+
+    def test_page_changelist(self):
+        """Page rows reuse the tenant joined into the changelist query."""
+        self.assert_constant_queries('/admin/admin_builder/adminpage/')
+
+    def test_widget_changelist(self):
+        """Widget rows reuse the page and tenant joined into the changelist query."""
+        self.assert_constant_queries('/admin/admin_builder/widget/')
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class PageEndpointQueryTest(TestCase):
+    """The page list and detail endpoints run a fixed number of queries."""
+
+    def setUp(self):
+        cache.clear()
+        user = get_user_model().objects.create_user('owner', 'owner@example.com', 'password')
+        self.tenant = user.tenant_memberships.get().tenant
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+        self.client.credentials(HTTP_X_TENANT_ID=str(self.tenant.id))
+
+    # Each request also looks up the tenant membership for X-Tenant-ID
+    def test_page_list(self):
+        """Listing pages is a count and one annotated query, however many pages."""
+        add_pages(self.tenant, 2)
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/admin-builder/pages/')
+        self.assertEqual(response.status_code, 200)
+        add_pages(self.tenant, 6)
+        with self.assertNumQueries(3):
+            self.client.get('/api/admin-builder/pages/')
+
+    def test_page_detail(self):
+        """A page's widgets are prefetched in one query."""
+        page = add_pages(self.tenant, 1, widgets_per_page=5)[0]
+        with self.assertNumQueries(3):
+            response = self.client.get(f'/api/admin-builder/pages/{page.id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['widgets']), 5)
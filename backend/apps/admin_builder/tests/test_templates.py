@@ -0,0 +1,78 @@
+"""
+Tests for the template catalog and apply_template.
+
+Run: python manage.py test apps.admin_builder
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from apps.tenants.models import Tenant
+from apps.admin_builder import templates_library
+from apps.admin_builder.models import AdminPage, DataSource, Widget
+from apps.admin_builder.services import AdminBuilderService
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class TemplateSpecTest(SimpleTestCase):
+    """Test compiled template specs."""
+    
+    def test_spec_is_shared(self):
+        """A catalog slug compiles once and returns the same spec."""
+        spec = templates_library.get_template_spec('simple-dashboard')
+        self.assertIsNotNone(spec)
+        self.assertIs(templates_library.get_template_spec('simple-dashboard'), spec)
+    
+    def test_unknown_slug_is_not_cached(self):
+        """Unknown slugs return None without adding cache entries."""
+        before = templates_library._template_spec.cache_info().currsize
+        for i in range(5):
+            self.assertIsNone(templates_library.get_template_spec(f'no-such-template-{i}'))
+        self.assertEqual(templates_library._template_spec.cache_info().currsize, before)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class ApplyTemplateTest(TestCase):
+    """Test creating pages, widgets and data sources from a template."""
+    
+    def setUp(self):
+        cache.clear()
+        owner = get_user_model().objects.create_user('owner', 'owner@example.com', 'password')
+        self.tenant = Tenant.objects.create(name='Acme', slug='acme', owner=owner)
+        self.service = AdminBuilderService(self.tenant)
+    
+    def test_creates_template_objects(self):
+        """Every page, widget and data source in the template is created."""
+        spec = templates_library.get_template_spec('ecommerce-dashboard')
+        pages = self.service.apply_template('ecommerce-dashboard')
+        
+        self.assertEqual(len(pages), len(spec.pages))
+        self.assertEqual(AdminPage.objects.filter(tenant=self.tenant).count(), len(spec.pages))
+        self.assertEqual(
+            Widget.objects.filter(page__tenant=self.tenant).count(),
+            sum(len(page.widgets) for page in spec.pages),
+        )
+        self.assertEqual(
+            DataSource.objects.filter(tenant=self.tenant).count(),
+            len(spec.data_sources),
+        )
+    
+    def test_inserts_are_batched(self):
+        """Pages, widgets and data sources are each inserted in one statement."""
+        with CaptureQueriesContext(connection) as ctx:
+            self.service.apply_template('ecommerce-dashboard')
+        inserts = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('INSERT')]
+        for model in (AdminPage, Widget, DataSource):
+            table = model._meta.db_table
+            self.assertEqual(
+                sum(1 for sql in inserts if sql.startswith(f'INSERT INTO "{table}"')), 1, table
+            )
+    
+    def test_unknown_template(self):
+        """An unknown slug raises ValueError and creates nothing."""
+        with self.assertRaises(ValueError):
+            self.service.apply_template('no-such-template')
+        self.assertFalse(AdminPage.objects.filter(tenant=self.tenant).exists())
@@ -1,23 +1,68 @@
-from django.urls import path, include
-from rest_framework.routers import DefaultRouter
-from .views import (
-    AdminBuilderConfigViewSet, AdminPageViewSet, WidgetViewSet,
-    DataSourceViewSet, TemplateViewSet, ExportViewSet
-)
-
-router = DefaultRouter()
-router.register(r'pages', AdminPageViewSet, basename='admin-page')
-router.register(r'widgets', WidgetViewSet, basename='widget')
-router.register(r'data-sources', DataSourceViewSet, basename='data-source')
-router.register(r'templates', TemplateViewSet, basename='template')
-router.register(r'exports', ExportViewSet, basename='export')
+from django.urls import path
+from django.utils.module_loading import import_string
+from django.views.decorators.csrf import csrf_exempt
+
+# Explicit routes instead of a DefaultRouter: the set of endpoints is small and
+# fixed, so skip router URL generation, format-suffix patterns and the API root
+LIST = {'get': 'list', 'post': 'create'}
+DETAIL = {'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'}
+
+
+def lazy_view(viewset: str, actions: dict):
+    """
+    Bind `actions` on a viewset from .views on first request, so loading the
+    URLconf (e.g. for system checks) doesn't import views, serializers and services.
+    """
+    view = None
+    
+    # DRF views are csrf-exempt and enforce CSRF in SessionAuthentication
+    @csrf_exempt
+    def dispatch(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = import_string(f'apps.admin_builder.views.{viewset}').as_view(actions)
+        return view(request, *args, **kwargs)
+    
+    return dispatch
+
 
 urlpatterns = [
-    path('', include(router.urls)),
+    # Pages
+    path('pages/', lazy_view('AdminPageViewSet', LIST), name='admin-page-list'),
+    path('pages/nav/', lazy_view('AdminPageViewSet', {'get': 'nav'}), name='admin-page-nav'),
+    path('pages/<uuid:pk>/', lazy_view('AdminPageViewSet', DETAIL), name='admin-page-detail'),
+    path('pages/<uuid:pk>/data/', lazy_view('AdminPageViewSet', {'get': 'data'}), name='admin-page-data'),
+    path('pages/<uuid:pk>/duplicate/', lazy_view('AdminPageViewSet', {'post': 'duplicate'}), name='admin-page-duplicate'),
+    path('pages/<uuid:pk>/publish/', lazy_view('AdminPageViewSet', {'post': 'publish'}), name='admin-page-publish'),
+    path('pages/<uuid:pk>/unpublish/', lazy_view('AdminPageViewSet', {'post': 'unpublish'}), name='admin-page-unpublish'),
+    
+    # Widgets
+    path('widgets/', lazy_view('WidgetViewSet', LIST), name='widget-list'),
+    path('widgets/types/', lazy_view('WidgetViewSet', {'get': 'types'}), name='widget-types'),
+    path('widgets/<uuid:pk>/', lazy_view('WidgetViewSet', DETAIL), name='widget-detail'),
+    
+    # Data sources
+    path('data-sources/', lazy_view('DataSourceViewSet', LIST), name='data-source-list'),
+    path('data-sources/types/', lazy_view('DataSourceViewSet', {'get': 'types'}), name='data-source-types'),
+    path('data-sources/<uuid:pk>/', lazy_view('DataSourceViewSet', DETAIL), name='data-source-detail'),
+    path('data-sources/<uuid:pk>/fetch/', lazy_view('DataSourceViewSet', {'get': 'fetch'}), name='data-source-fetch'),
+    
+    # Templates
+    path('templates/', lazy_view('TemplateViewSet', {'get': 'list'}), name='template-list'),
+    path('templates/apply/', lazy_view('TemplateViewSet', {'post': 'apply'}), name='template-apply'),
+    path('templates/categories/', lazy_view('TemplateViewSet', {'get': 'categories'}), name='template-categories'),
+    path('templates/<slug:pk>/', lazy_view('TemplateViewSet', {'get': 'retrieve'}), name='template-detail'),
+    
+    # Exports
+    path('exports/', lazy_view('ExportViewSet', {'get': 'list'}), name='export-list'),
+    path('exports/create_export/', lazy_view('ExportViewSet', {'post': 'create_export'}), name='export-create-export'),
+    path('exports/<uuid:pk>/', lazy_view('ExportViewSet', {'get': 'retrieve'}), name='export-detail'),
+    path('exports/<uuid:pk>/code/', lazy_view('ExportViewSet', {'get': 'code'}), name='export-code'),
     
     # Config
-    path('config/', AdminBuilderConfigViewSet.as_view({'get': 'config'}), name='admin-builder-config'),
-    path('config/update/', AdminBuilderConfigViewSet.as_view({'put': 'update_config', 'patch': 'update_config'}), name='admin-builder-config-update'),
+    path('config/', lazy_view('AdminBuilderConfigViewSet', {'get': 'config'}), name='admin-builder-config'),
+    path('config/status/', lazy_view('AdminBuilderConfigViewSet', {'get': 'config_status'}), name='admin-builder-config-status'),
+    path('config/update/', lazy_view('AdminBuilderConfigViewSet', {'put': 'update_config', 'patch': 'update_config'}), name='admin-builder-config-update'),
 ]
 
 
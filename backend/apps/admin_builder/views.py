@@ -2,35 +2,64 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.cache import patch_cache_control
 
 from apps.tenants.permissions import TenantPermission
+from apps.tenants.utils import TenantScopedMixin
 from .models import (
     AdminBuilderConfig, AdminPage, Widget, DataSource, ExportedAdmin
 )
 from .serializers import (
-    AdminBuilderConfigSerializer,
+    AdminBuilderConfigSerializer, AdminBuilderConfigMinimalSerializer,
     AdminPageSerializer, AdminPageListSerializer, AdminPageCreateSerializer,
+    AdminPageNavSerializer,
     WidgetSerializer, WidgetCreateSerializer,
     DataSourceSerializer, DataSourceCreateSerializer,
-    AdminTemplateSerializer, ApplyTemplateSerializer,
+    ApplyTemplateSerializer,
     ExportedAdminSerializer, ExportRequestSerializer,
-    WIDGET_TYPES
+    WIDGET_TYPES_PAYLOAD, DATA_SOURCE_TYPES_PAYLOAD, TEMPLATE_CATEGORIES_PAYLOAD,
+    get_template_detail_payload, get_template_list_payload
 )
+from .renderers import ORJSONRenderer
 from .services import AdminBuilderService
 
 
-class AdminBuilderConfigViewSet(viewsets.ViewSet):
+def _etag_response(request, payload: bytes, etag: str, max_age: int = None) -> HttpResponse:
+    """Return a JSON body, or 304 if the client already has this version."""
+    if request.headers.get('If-None-Match') == etag:
+        response = HttpResponse(status=304)
+    else:
+        response = HttpResponse(payload, content_type='application/json')
+    response['ETag'] = etag
+    if max_age is not None:
+        patch_cache_control(response, private=True, max_age=max_age)
+    return response
+
+
+# Catalogs that only change with a deploy can be reused by the browser
+STATIC_CATALOG_MAX_AGE = 3600
+
+
+class AdminBuilderConfigViewSet(TenantScopedMixin, viewsets.ViewSet):
     """ViewSet for admin builder configuration."""
     permission_classes = [IsAuthenticated, TenantPermission]
     
-    def _get_config(self, request):
-        tenant = getattr(request, 'tenant', None)
+    def _get_config(self, request, for_update=False):
+        tenant = self.tenant
         if not tenant:
             return None
-        config, _ = AdminBuilderConfig.objects.get_or_create(tenant=tenant)
-        return config
+        if for_update:
+            config, _ = AdminBuilderConfig.objects.get_or_create(tenant=tenant)
+            return config
+        # Reads share the service's per-tenant cache, dropped by signals.py on save
+        return AdminBuilderService(tenant).config
     
     @action(detail=False, methods=['get'])
     def config(self, request):
@@ -39,9 +68,17 @@ class AdminBuilderConfigViewSet(viewsets.ViewSet):
             return Response({'error': 'No tenant'}, status=400)
         return Response(AdminBuilderConfigSerializer(config).data)
     
+    @action(detail=False, methods=['get'])
+    def config_status(self, request):
+        """Get the enabled state and branding name without the custom code fields."""
+        config = self._get_config(request)
+        if not config:
+            return Response({'error': 'No tenant'}, status=400)
+        return Response(AdminBuilderConfigMinimalSerializer(config).data)
+    
     @action(detail=False, methods=['put', 'patch'])
     def update_config(self, request):
-        config = self._get_config(request)
+        config = self._get_config(request, for_update=True)
         if not config:
             return Response({'error': 'No tenant'}, status=400)
         
@@ -53,8 +90,9 @@ class AdminBuilderConfigViewSet(viewsets.ViewSet):
         return Response(serializer.data)
 
 
-class AdminPageViewSet(viewsets.ModelViewSet):
+class AdminPageViewSet(TenantScopedMixin, viewsets.ModelViewSet):
     """ViewSet for admin pages."""
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
     permission_classes = [IsAuthenticated, TenantPermission]
     
     def get_serializer_class(self):
@@ -65,15 +103,43 @@ class AdminPageViewSet(viewsets.ModelViewSet):
         return AdminPageSerializer
     
     def get_queryset(self):
-        tenant = getattr(self.request, 'tenant', None)
+        tenant = self.tenant
         if not tenant:
             return AdminPage.objects.none()
-        return AdminPage.objects.filter(tenant=tenant).prefetch_related('widgets')
+        qs = AdminPage.objects.filter(tenant=tenant)
+        if self.action == 'list':
+            # The list serializer only needs widget counts. Meta.ordering is
+            # dropped from GROUP BY queries, so restate it for pagination.
+            return qs.only(
+                'id', 'name', 'slug', 'title', 'icon',
+                'page_type', 'show_in_nav', 'nav_order', 'is_published'
+            ).annotate(widget_count=Count('widgets')).order_by('nav_order', 'name')
+        if self.action in ('data', 'duplicate'):
+            return qs
+        return qs.prefetch_related('widgets')
     
     def perform_create(self, serializer):
-        tenant = getattr(self.request, 'tenant', None)
+        tenant = self.tenant
         serializer.save(tenant=tenant)
     
+    @action(detail=False, methods=['get'])
+    def nav(self, request):
+        """Get sidebar navigation entries."""
+        tenant = self.tenant
+        pages = AdminPage.objects.filter(tenant=tenant, show_in_nav=True).only(
+            'id', 'name', 'slug', 'icon', 'parent_id', 'nav_order', 'is_published'
+        ).annotate(
+            has_widgets=Exists(Widget.objects.filter(page=OuterRef('pk')))
+        )
+        return Response(AdminPageNavSerializer(pages, many=True).data)
+    
+    @action(detail=True, methods=['get'])
+    def data(self, request, pk=None):
+        """Get data for all of a page's widgets, sharing fetches between them."""
+        page = self.get_object()
+        service = AdminBuilderService(self.tenant)
+        return Response(service.fetch_page_data(page))
+    
     @action(detail=True, methods=['post'])
     def publish(self, request, pk=None):
         """Publish a page."""
@@ -93,39 +159,44 @@ class AdminPageViewSet(viewsets.ModelViewSet):
     def duplicate(self, request, pk=None):
         """Duplicate a page."""
         page = self.get_object()
-        tenant = getattr(request, 'tenant', None)
+        tenant = self.tenant
         
-        # Create new page
-        new_page = AdminPage.objects.create(
-            tenant=tenant,
-            name=f"{page.name} (Copy)",
-            slug=f"{page.slug}-copy",
-            title=page.title,
-            description=page.description,
-            icon=page.icon,
-            page_type=page.page_type,
-            layout=page.layout,
-            nav_order=page.nav_order + 1,
-            is_published=False
+        widgets = Widget.objects.filter(page=page).only(
+            'name', 'widget_type', 'config', 'style', 'data_source_id', 'data_query'
         )
         
-        # Duplicate widgets
-        for widget in page.widgets.all():
-            Widget.objects.create(
-                page=new_page,
-                name=widget.name,
-                widget_type=widget.widget_type,
-                config=widget.config,
-                style=widget.style,
-                data_source=widget.data_source,
-                data_query=widget.data_query
+        with transaction.atomic():
+            new_page = AdminPage.objects.create(
+                tenant=tenant,
+                name=f"{page.name} (Copy)",
+                slug=f"{page.slug}-copy",
+                title=page.title,
+                description=page.description,
+                icon=page.icon,
+                page_type=page.page_type,
+                layout=page.layout,
+                nav_order=page.nav_order + 1,
+                is_published=False
             )
+            Widget.objects.bulk_create([
+                Widget(
+                    page=new_page,
+                    name=widget.name,
+                    widget_type=widget.widget_type,
+                    config=widget.config,
+                    style=widget.style,
+                    data_source_id=widget.data_source_id,
+                    data_query=widget.data_query
+                )
+                for widget in widgets
+            ], batch_size=500)
         
         return Response(AdminPageSerializer(new_page).data, status=status.HTTP_201_CREATED)
 
 
-class WidgetViewSet(viewsets.ModelViewSet):
+class WidgetViewSet(TenantScopedMixin, viewsets.ModelViewSet):
     """ViewSet for widgets."""
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
     permission_classes = [IsAuthenticated, TenantPermission]
     
     def get_serializer_class(self):
@@ -134,7 +205,7 @@ class WidgetViewSet(viewsets.ModelViewSet):
         return WidgetSerializer
     
     def get_queryset(self):
-        tenant = getattr(self.request, 'tenant', None)
+        tenant = self.tenant
         if not tenant:
             return Widget.objects.none()
         return Widget.objects.filter(page__tenant=tenant)
@@ -144,9 +215,10 @@ class WidgetViewSet(viewsets.ModelViewSet):
         if not page_id:
             return Response({'error': 'page_id required'}, status=400)
         
-        tenant = getattr(request, 'tenant', None)
+        tenant = self.tenant
         try:
-            page = AdminPage.objects.get(id=page_id, tenant=tenant)
+            # Only the key is needed to attach the widget
+            page = AdminPage.objects.only('id').get(id=page_id, tenant=tenant)
         except AdminPage.DoesNotExist:
             return Response({'error': 'Page not found'}, status=404)
         
@@ -159,10 +231,10 @@ class WidgetViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def types(self, request):
         """Get available widget types."""
-        return Response(WIDGET_TYPES)
+        return _etag_response(request, *WIDGET_TYPES_PAYLOAD, max_age=STATIC_CATALOG_MAX_AGE)
 
 
-class DataSourceViewSet(viewsets.ModelViewSet):
+class DataSourceViewSet(TenantScopedMixin, viewsets.ModelViewSet):
     """ViewSet for data sources."""
     permission_classes = [IsAuthenticated, TenantPermission]
     
@@ -172,73 +244,56 @@ class DataSourceViewSet(viewsets.ModelViewSet):
         return DataSourceSerializer
     
     def get_queryset(self):
-        tenant = getattr(self.request, 'tenant', None)
+        tenant = self.tenant
         if not tenant:
             return DataSource.objects.none()
         return DataSource.objects.filter(tenant=tenant)
     
     def perform_create(self, serializer):
-        tenant = getattr(self.request, 'tenant', None)
+        tenant = self.tenant
         serializer.save(tenant=tenant)
     
     @action(detail=True, methods=['get'])
     def fetch(self, request, pk=None):
         """Fetch data from a data source."""
         ds = self.get_object()
-        tenant = getattr(request, 'tenant', None)
+        tenant = self.tenant
         
         service = AdminBuilderService(tenant)
-        data = service.fetch_data_source(ds)
+        data = service.fetch_data_source_or_queue(ds, request.query_params.dict())
+        if data is None:
+            # Fetch queued for an external API; poll again for the result
+            return Response({'status': 'pending'}, status=status.HTTP_202_ACCEPTED)
         
         return Response(data)
     
     @action(detail=False, methods=['get'])
     def types(self, request):
         """Get available data source types."""
-        return Response([
-            {'type': 'api', 'name': 'External API', 'icon': '🌐'},
-            {'type': 'database', 'name': 'Database Collection', 'icon': '🗄️'},
-            {'type': 'static', 'name': 'Static Data', 'icon': '📦'},
-            {'type': 'checkout_orders', 'name': 'Orders', 'icon': '📦'},
-            {'type': 'checkout_products', 'name': 'Products', 'icon': '🏷️'},
-            {'type': 'cabinet_users', 'name': 'Users', 'icon': '👥'},
-            {'type': 'cabinet_tickets', 'name': 'Support Tickets', 'icon': '🎫'},
-            {'type': 'storage_files', 'name': 'Files', 'icon': '📁'},
-            {'type': 'analytics_events', 'name': 'Analytics Events', 'icon': '📈'},
-        ])
+        return _etag_response(request, *DATA_SOURCE_TYPES_PAYLOAD, max_age=STATIC_CATALOG_MAX_AGE)
 
 
-class TemplateViewSet(viewsets.ViewSet):
+class TemplateViewSet(TenantScopedMixin, viewsets.ViewSet):
     """ViewSet for admin templates."""
     permission_classes = [IsAuthenticated, TenantPermission]
     
     def list(self, request):
         """List all templates."""
-        tenant = getattr(request, 'tenant', None)
-        service = AdminBuilderService(tenant)
-        
         category = request.query_params.get('category')
-        templates = service.get_templates(category)
-        
-        serializer = AdminTemplateSerializer(templates, many=True)
-        return Response(serializer.data)
+        return _etag_response(request, *get_template_list_payload(category))
     
     def retrieve(self, request, pk=None):
         """Get a specific template."""
-        tenant = getattr(request, 'tenant', None)
-        service = AdminBuilderService(tenant)
-        
-        template = service.get_template(pk)
-        if not template:
+        cached = get_template_detail_payload(pk)
+        if cached is None:
             return Response({'error': 'Template not found'}, status=404)
         
-        serializer = AdminTemplateSerializer(template)
-        return Response(serializer.data)
+        return _etag_response(request, *cached)
     
     @action(detail=False, methods=['post'])
     def apply(self, request):
         """Apply a template to create pages."""
-        tenant = getattr(request, 'tenant', None)
+        tenant = self.tenant
         
         serializer = ApplyTemplateSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -247,6 +302,9 @@ class TemplateViewSet(viewsets.ViewSet):
         
         try:
             pages = service.apply_template(serializer.validated_data['template_slug'])
+            pages = AdminPage.objects.filter(
+                id__in=[p.id for p in pages]
+            ).annotate(widget_count=Count('widgets')).order_by('nav_order', 'name')
             return Response({
                 'success': True,
                 'pages_created': len(pages),
@@ -258,35 +316,29 @@ class TemplateViewSet(viewsets.ViewSet):
     @action(detail=False, methods=['get'])
     def categories(self, request):
         """Get template categories."""
-        return Response([
-            {'slug': 'dashboard', 'name': 'Dashboard', 'icon': '📊'},
-            {'slug': 'ecommerce', 'name': 'E-Commerce', 'icon': '🛒'},
-            {'slug': 'crm', 'name': 'CRM', 'icon': '💼'},
-            {'slug': 'cms', 'name': 'Content Management', 'icon': '📝'},
-            {'slug': 'analytics', 'name': 'Analytics', 'icon': '📈'},
-            {'slug': 'project', 'name': 'Project Management', 'icon': '📋'},
-            {'slug': 'hr', 'name': 'HR Management', 'icon': '👔'},
-            {'slug': 'finance', 'name': 'Finance', 'icon': '💰'},
-            {'slug': 'support', 'name': 'Support/Helpdesk', 'icon': '🎫'},
-            {'slug': 'social', 'name': 'Social Media', 'icon': '📱'},
-        ])
+        return _etag_response(request, *TEMPLATE_CATEGORIES_PAYLOAD, max_age=STATIC_CATALOG_MAX_AGE)
 
 
-class ExportViewSet(viewsets.ViewSet):
+class ExportViewSet(TenantScopedMixin, viewsets.ViewSet):
     """ViewSet for exporting admin panels."""
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
     permission_classes = [IsAuthenticated, TenantPermission]
     
     def list(self, request):
         """List previous exports."""
-        tenant = getattr(request, 'tenant', None)
-        exports = ExportedAdmin.objects.filter(tenant=tenant)
-        serializer = ExportedAdminSerializer(exports, many=True)
-        return Response(serializer.data)
+        tenant = self.tenant
+        # The list serializer never exposes the generated code bundle or build log
+        exports = ExportedAdmin.objects.filter(tenant=tenant).defer('code_blob', 'build_log')
+        # Page like the model viewsets, which get the default paginator
+        paginator = api_settings.DEFAULT_PAGINATION_CLASS()
+        page = paginator.paginate_queryset(exports, request, view=self)
+        serializer = ExportedAdminSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
     
     @action(detail=False, methods=['post'])
     def create_export(self, request):
         """Create a new export."""
-        tenant = getattr(request, 'tenant', None)
+        tenant = self.tenant
         
         serializer = ExportRequestSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -297,18 +349,28 @@ class ExportViewSet(viewsets.ViewSet):
         return Response(ExportedAdminSerializer(export).data, status=status.HTTP_201_CREATED)
     
     def retrieve(self, request, pk=None):
-        """Get an export with code."""
-        tenant = getattr(request, 'tenant', None)
+        """Get an export's details; the code is served by `code`."""
+        tenant = self.tenant
         
         try:
-            export = ExportedAdmin.objects.get(id=pk, tenant=tenant)
+            export = ExportedAdmin.objects.defer('code_blob').get(id=pk, tenant=tenant)
         except ExportedAdmin.DoesNotExist:
             return Response({'error': 'Export not found'}, status=404)
         
-        return Response({
-            **ExportedAdminSerializer(export).data,
-            'code': export.code
-        })
+        return Response(ExportedAdminSerializer(export).data)
+    
+    @action(detail=True, methods=['get'])
+    def code(self, request, pk=None):
+        """Stream an export's generated code as JSON."""
+        tenant = self.tenant
+        
+        export = ExportedAdmin.objects.only('id', 'tenant_id', 'code_blob').filter(
+            id=pk, tenant=tenant
+        ).first()
+        if export is None:
+            return Response({'error': 'Export not found'}, status=404)
+        
+        return StreamingHttpResponse(export.iter_code_json(), content_type='application/json')
 
 
 
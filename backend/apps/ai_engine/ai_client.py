@@ -2,20 +2,93 @@
 Anthropic Claude client for code generation
 """
 import os
-import json
+import hashlib
+import logging
 import re
+from functools import lru_cache
+
 import anthropic
+import orjson
 from django.conf import settings
+from django.core.cache import cache
+
+from apps.projects.progress import append_project_message
+from .prompts import (
+    render_analyze_app, render_django_model,
+    render_drf_serializer, render_drf_view,
+    render_react_component, render_refine_code
+)
+
+logger = logging.getLogger(__name__)
+
+# Markdown code fences around generated code, e.g. ```tsx ... ```
+_CODE_FENCE_OPEN = re.compile(r'^```\w*\n', re.MULTILINE)
+_CODE_FENCE_CLOSE = re.compile(r'\n```$', re.MULTILINE)
+
+# Temperature-0 generations are deterministic enough that identical
+# requests reuse the previous response instead of calling the API again.
+# Warmer calls stay uncached so retries and regenerations get a fresh answer.
+RESPONSE_CACHE_TTL = 86400
+
+
+# Analysis sections the generators iterate over, and the keys each entry needs
+ANALYSIS_SECTIONS = {
+    'models': ('name', 'fields'),
+    'relationships': ('from_model',),
+    'api_endpoints': ('path', 'method'),
+    'ui_components': ('name',),
+}
+
+
+def _normalize_analysis(analysis):
+    """
+    Check the AI's analysis has the shape the generators rely on, filling
+    in missing sections, so malformed output fails here with a ValueError
+    instead of as a KeyError halfway through generation.
+    """
+    if not isinstance(analysis, dict):
+        raise ValueError("App analysis must be a JSON object")
+    
+    for section, required in ANALYSIS_SECTIONS.items():
+        entries = analysis.get(section) or []
+        if not isinstance(entries, list) or not all(
+            isinstance(entry, dict) and all(key in entry for key in required)
+            for entry in entries
+        ):
+            raise ValueError(f"App analysis has a malformed '{section}' section")
+        analysis[section] = entries
+    
+    styling = analysis.get('styling') or {}
+    if not isinstance(styling, dict):
+        raise ValueError("App analysis has a malformed 'styling' section")
+    analysis['styling'] = styling
+    
+    return analysis
+
+
+def _prompt_json(value):
+    """Pretty-print `value` as JSON for embedding in a prompt."""
+    return orjson.dumps(value, option=orjson.OPT_INDENT_2).decode()
+
+
+@lru_cache(maxsize=None)
+def get_anthropic_client() -> anthropic.Anthropic:
+    """
+    Process-wide Anthropic client, so generations reuse its keep-alive
+    connection pool instead of opening a new TLS session per AIClient.
+    Built on first use, so forked Celery workers each get their own.
+    """
+    return anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
 
 
 class AIClient:
     """Wrapper for Anthropic Claude API"""
     
     def __init__(self):
-        self.client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
+        self.client = get_anthropic_client()
         self.model = "claude-sonnet-4-20250514"  # Using Claude Opus 4.5 for best results
     
-    def chat_completion(self, messages, temperature=0.7, response_format=None, project_id=None, step_description="Processing"):
+    def chat_completion(self, messages, temperature=0.7, response_format=None, project_id=None, step_description="Processing", llm=None):
         """
         Send a chat completion request to Anthropic Claude
         
@@ -25,53 +98,29 @@ class AIClient:
             response_format: Optional response format (e.g., {"type": "json_object"})
             project_id: Project ID to broadcast progress to
             step_description: Description of what this API call is for
+            llm: Optional LLMConfig whose model and max_tokens replace the defaults
         
         Returns:
             Response text from the API
         """
         # Broadcast what we're asking AI - ADD to message history
         if project_id and step_description:
-            from django.core.cache import cache
-            from django.utils import timezone
-            import json
-            
-            print(f"🔥 BROADCASTING: {step_description} for project {project_id}")
-            
-            # Get existing messages
-            messages_key = f'project_messages_{project_id}'
-            existing = cache.get(messages_key, [])
-            
-            print(f"🔥 Existing messages: {len(existing)}")
-            
-            # Add new message
-            existing.append({
-                'id': f'{project_id}_{len(existing)}',
-                'type': 'thinking',
-                'content': f'🤖 {step_description}...',
-                'timestamp': timezone.now().isoformat()
-            })
-            
-            cache.set(messages_key, existing, timeout=3600)
-            print(f"🔥 Saved {len(existing)} messages to cache")
+            logger.debug("Broadcasting %s for project %s", step_description, project_id)
+            append_project_message(project_id, 'thinking', f'🤖 {step_description}...')
 
-        # Convert messages to Anthropic format
-        # Extract system message if present
-        system_content = None
-        anthropic_messages = []
-        
-        for msg in messages:
-            if msg['role'] == 'system':
-                system_content = msg['content']
-            else:
-                anthropic_messages.append({
-                    'role': msg['role'],
-                    'content': msg['content']
-                })
+        # Convert messages to Anthropic format: callers put the system prompt
+        # first, so split it off and pass the rest through unchanged
+        if messages and messages[0]['role'] == 'system':
+            system_content = messages[0]['content']
+            anthropic_messages = messages[1:]
+        else:
+            system_content = None
+            anthropic_messages = messages
         
         # Build request kwargs
         kwargs = {
-            "model": self.model,
-            "max_tokens": 8192,
+            "model": llm.model if llm else self.model,
+            "max_tokens": llm.max_tokens if llm else 8192,
             "messages": anthropic_messages,
         }
         
@@ -81,46 +130,40 @@ class AIClient:
         if temperature != 1.0:
             kwargs["temperature"] = min(temperature, 1.0)  # Anthropic max temp is 1.0
         
-        response = self.client.messages.create(**kwargs)
-        result = response.content[0].text
+        cache_key = None
+        result = None
+        if temperature == 0:
+            digest = hashlib.sha256(orjson.dumps(kwargs, option=orjson.OPT_SORT_KEYS)).hexdigest()
+            cache_key = f'claude:{digest}'
+            result = cache.get(cache_key)
         
-        # Log token usage
-        if hasattr(response, 'usage') and response.usage:
-            print(f"🔢 Tokens - Input: {response.usage.input_tokens}, Output: {response.usage.output_tokens}")
-        
-        # Strip code block markers if present
-        result = self._strip_code_markers(result)
+        if result is None:
+            response = self.client.messages.create(**kwargs)
+            result = response.content[0].text
+            
+            # Log token usage
+            if hasattr(response, 'usage') and response.usage:
+                logger.info(
+                    "Tokens - input: %d, output: %d",
+                    response.usage.input_tokens, response.usage.output_tokens
+                )
+            
+            # Strip code block markers if present
+            result = self._strip_code_markers(result)
+            
+            if cache_key:
+                cache.set(cache_key, result, timeout=RESPONSE_CACHE_TTL)
         
         # Broadcast response - ADD to message history
         if project_id and step_description:
-            from django.core.cache import cache
-            from django.utils import timezone
-            
-            messages_key = f'project_messages_{project_id}'
-            existing = cache.get(messages_key, [])
-            
             preview = result[:150].replace('\n', ' ') + "..." if len(result) > 150 else result
-            existing.append({
-                'id': f'{project_id}_{len(existing)}',
-                'type': 'success',
-                'content': f'✅ {step_description}: {preview}',
-                'timestamp': timezone.now().isoformat()
-            })
-            
-            cache.set(messages_key, existing, timeout=3600)
+            append_project_message(project_id, 'success', f'✅ {step_description}: {preview}')
         
         return result
     
     def _strip_code_markers(self, code):
         """Remove markdown code block markers from AI response"""
-        import re
-        
-        # Remove ```tsx ... ``` or ```python ... ``` etc
-        code = re.sub(r'^```\w*\n', '', code, flags=re.MULTILINE)
-        code = re.sub(r'\n```$', '', code, flags=re.MULTILINE)
-        code = code.strip()
-        
-        return code
+        return _CODE_FENCE_CLOSE.sub('', _CODE_FENCE_OPEN.sub('', code)).strip()
     
     def analyze_app_description(self, user_prompt, project_id=None):
         """
@@ -133,8 +176,6 @@ class AIClient:
         Returns:
             Dict with structured analysis
         """
-        from .prompts import ANALYZE_APP_PROMPT
-        
         messages = [
             {
                 "role": "system",
@@ -142,7 +183,7 @@ class AIClient:
             },
             {
                 "role": "user",
-                "content": ANALYZE_APP_PROMPT.format(user_prompt=user_prompt)
+                "content": render_analyze_app(user_prompt=user_prompt)
             }
         ]
         
@@ -154,12 +195,10 @@ class AIClient:
             step_description="Analyzing app requirements"
         )
         
-        return json.loads(response)
+        return _normalize_analysis(orjson.loads(response))
     
     def generate_django_model(self, model_name, fields, relationships, project_id=None):
         """Generate Django model code"""
-        from .prompts import GENERATE_DJANGO_MODEL_PROMPT
-        
         messages = [
             {
                 "role": "system",
@@ -167,10 +206,10 @@ class AIClient:
             },
             {
                 "role": "user",
-                "content": GENERATE_DJANGO_MODEL_PROMPT.format(
+                "content": render_django_model(
                     model_name=model_name,
-                    fields=json.dumps(fields, indent=2),
-                    relationships=json.dumps(relationships, indent=2)
+                    fields=_prompt_json(fields),
+                    relationships=_prompt_json(relationships)
                 )
             }
         ]
@@ -182,10 +221,8 @@ class AIClient:
             step_description=f"Generating Django model: {model_name}"
         )
     
-    def generate_serializer(self, model_name, fields, project_id=None):
+    def generate_serializer(self, model_name, fields, project_id=None, llm=None):
         """Generate DRF serializer code"""
-        from .prompts import GENERATE_DRF_SERIALIZER_PROMPT
-        
         messages = [
             {
                 "role": "system",
@@ -193,9 +230,9 @@ class AIClient:
             },
             {
                 "role": "user",
-                "content": GENERATE_DRF_SERIALIZER_PROMPT.format(
+                "content": render_drf_serializer(
                     model_name=model_name,
-                    fields=json.dumps(fields, indent=2)
+                    fields=_prompt_json(fields)
                 )
             }
         ]
@@ -204,13 +241,12 @@ class AIClient:
             messages=messages,
             temperature=0.3,
             project_id=project_id,
-            step_description=f"Generating API serializer: {model_name}"
+            step_description=f"Generating API serializer: {model_name}",
+            llm=llm
         )
     
     def generate_viewset(self, model_name, endpoints, permissions="IsAuthenticated", project_id=None):
         """Generate DRF viewset code"""
-        from .prompts import GENERATE_DRF_VIEW_PROMPT
-        
         messages = [
             {
                 "role": "system",
@@ -218,9 +254,9 @@ class AIClient:
             },
             {
                 "role": "user",
-                "content": GENERATE_DRF_VIEW_PROMPT.format(
+                "content": render_drf_view(
                     model_name=model_name,
-                    endpoints=json.dumps(endpoints, indent=2),
+                    endpoints=_prompt_json(endpoints),
                     permissions=permissions
                 )
             }
@@ -235,8 +271,6 @@ class AIClient:
     
     def generate_react_component(self, component_name, component_type, description, data_fields, project_id=None):
         """Generate React component code"""
-        from .prompts import GENERATE_REACT_COMPONENT_PROMPT
-        
         messages = [
             {
                 "role": "system",
@@ -244,11 +278,11 @@ class AIClient:
             },
             {
                 "role": "user",
-                "content": GENERATE_REACT_COMPONENT_PROMPT.format(
+                "content": render_react_component(
                     component_name=component_name,
                     component_type=component_type,
                     description=description,
-                    data_fields=json.dumps(data_fields, indent=2)
+                    data_fields=_prompt_json(data_fields)
                 )
             }
         ]
@@ -262,8 +296,6 @@ class AIClient:
     
     def refine_code(self, original_code, user_feedback):
         """Refine code based on user feedback"""
-        from .prompts import REFINE_CODE_PROMPT
-        
         messages = [
             {
                 "role": "system",
@@ -271,7 +303,7 @@ class AIClient:
             },
             {
                 "role": "user",
-                "content": REFINE_CODE_PROMPT.format(
+                "content": render_refine_code(
                     original_code=original_code,
                     user_feedback=user_feedback
                 )
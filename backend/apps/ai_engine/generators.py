@@ -1,15 +1,48 @@
 """
 Code generators for different components
 """
-import json
+import io
+import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from .ai_client import AIClient
+from .llm_config import TaskType, get_llm_for_task
+
+# Generations are independent, network-bound API calls, so run a few at once
+GENERATION_WORKERS = 4
+
+# Imports and section heading at the top of the combined API module
+API_CODE_HEADER = """from rest_framework import serializers, viewsets, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from django.shortcuts import get_object_or_404
+from .models import *
+
+# Serializers
+"""
+
+
+def generate_all(generate, jobs):
+    """
+    Call `generate(**kwargs)` for each (name, kwargs) job concurrently
+    
+    Returns:
+        Dict mapping job names to results, in job order
+    """
+    jobs = list(jobs)
+    if len(jobs) <= 1:
+        return {name: generate(**kwargs) for name, kwargs in jobs}
+    with ThreadPoolExecutor(max_workers=min(GENERATION_WORKERS, len(jobs))) as pool:
+        futures = [(name, pool.submit(generate, **kwargs)) for name, kwargs in jobs]
+        return {name: future.result() for name, future in futures}
 
 
 class SchemaGenerator:
     """Generate database schema and Django models"""
     
-    def __init__(self):
-        self.ai_client = AIClient()
+    def __init__(self, ai_client=None):
+        self.ai_client = ai_client or AIClient()
     
     def generate_models(self, analysis, project_id=None):
         """
@@ -25,28 +58,25 @@ class SchemaGenerator:
         models = analysis.get('models', [])
         relationships = analysis.get('relationships', [])
         
-        generated_models = {}
+        # Index relationships by source model once instead of filtering per model
+        relationships_by_model = defaultdict(list)
+        for relationship in relationships:
+            relationships_by_model[relationship['from_model']].append(relationship)
+        
+        jobs = []
         
         for model in models:
             model_name = model['name']
             fields = model['fields']
             
-            # Filter relationships for this model
-            model_relationships = [
-                r for r in relationships 
-                if r['from_model'] == model_name
-            ]
-            
-            code = self.ai_client.generate_django_model(
+            jobs.append((model_name, dict(
                 model_name=model_name,
                 fields=fields,
-                relationships=model_relationships,
+                relationships=relationships_by_model.get(model_name, ()),
                 project_id=project_id
-            )
-            
-            generated_models[model_name] = code
+            )))
         
-        return generated_models
+        return generate_all(self.ai_client.generate_django_model, jobs)
     
     def create_schema_json(self, analysis):
         """Create JSON representation of database schema"""
@@ -62,100 +92,95 @@ class SchemaGenerator:
 class APIGenerator:
     """Generate REST API endpoints"""
     
-    def __init__(self):
-        self.ai_client = AIClient()
+    def __init__(self, ai_client=None):
+        self.ai_client = ai_client or AIClient()
     
     def generate_serializers(self, analysis, project_id=None):
         """Generate DRF serializers for all models"""
         models = analysis.get('models', [])
+        # Serializers are boilerplate over the model fields, so a smaller,
+        # faster model is enough
+        llm = get_llm_for_task(TaskType.CODE_GENERATION_SIMPLE)
         
-        generated_serializers = {}
+        jobs = []
         
         for model in models:
             model_name = model['name']
             fields = model['fields']
             
-            code = self.ai_client.generate_serializer(
+            jobs.append((model_name, dict(
                 model_name=model_name,
                 fields=fields,
-                project_id=project_id
-            )
-            
-            generated_serializers[model_name] = code
+                project_id=project_id,
+                llm=llm
+            )))
         
-        return generated_serializers
+        return generate_all(self.ai_client.generate_serializer, jobs)
     
     def generate_viewsets(self, analysis, project_id=None):
         """Generate DRF viewsets for all endpoints"""
         models = analysis.get('models', [])
         api_endpoints = analysis.get('api_endpoints', [])
         
-        # Group endpoints by model
-        endpoints_by_model = {}
+        # Group endpoints by model, matching the path resource against the
+        # model names case-insensitively
+        name_by_lower = {model['name'].lower(): model['name'] for model in models}
+        endpoints_by_model = defaultdict(list)
         for endpoint in api_endpoints:
             # Try to infer model from path (simple heuristic)
             path_parts = endpoint['path'].strip('/').split('/')
             if len(path_parts) >= 2:
                 resource = path_parts[-1] if path_parts[-1] != '{id}' else path_parts[-2]
-                # Singularize and capitalize (simple approach)
-                model_name = resource.rstrip('s').capitalize()
-                
-                if model_name not in endpoints_by_model:
-                    endpoints_by_model[model_name] = []
-                endpoints_by_model[model_name].append(endpoint)
+                resource = resource.lower()
+                # Plural or singular resource name (simple approach)
+                model_name = name_by_lower.get(resource) or name_by_lower.get(resource.rstrip('s'))
+                if model_name:
+                    endpoints_by_model[model_name].append(endpoint)
         
-        generated_viewsets = {}
+        jobs = []
         
         for model in models:
             model_name = model['name']
             endpoints = endpoints_by_model.get(model_name, [])
             
-            code = self.ai_client.generate_viewset(
+            jobs.append((model_name, dict(
                 model_name=model_name,
                 endpoints=endpoints,
                 permissions="IsAuthenticated",
                 project_id=project_id
-            )
-            
-            generated_viewsets[model_name] = code
+            )))
         
-        return generated_viewsets
+        return generate_all(self.ai_client.generate_viewset, jobs)
     
-    def combine_api_code(self, serializers, viewsets):
-        """Combine all API code into single file"""
-        code_parts = [
-            "from rest_framework import serializers, viewsets, status",
-            "from rest_framework.decorators import action",
-            "from rest_framework.response import Response",
-            "from rest_framework.permissions import IsAuthenticated",
-            "from django.shortcuts import get_object_or_404",
-            "from .models import *",
-            "",
-            "# Serializers",
-            ""
-        ]
+    def combine_api_code(self, serializers, viewsets, out=None):
+        """
+        Combine all API code into single file
+        
+        Writes to the text stream `out` when given (e.g. an open file), so
+        large APIs aren't assembled in memory first; otherwise returns the code.
+        """
+        buffer = io.StringIO() if out is None else out
+        write = buffer.write
+        
+        write(API_CODE_HEADER)
         
         for model_name, code in serializers.items():
-            code_parts.append(f"# {model_name} Serializer")
-            code_parts.append(code)
-            code_parts.append("")
+            write(f"\n# {model_name} Serializer\n{code}\n")
         
-        code_parts.append("# ViewSets")
-        code_parts.append("")
+        write("\n# ViewSets\n")
         
         for model_name, code in viewsets.items():
-            code_parts.append(f"# {model_name} ViewSet")
-            code_parts.append(code)
-            code_parts.append("")
+            write(f"\n# {model_name} ViewSet\n{code}\n")
         
-        return "\n".join(code_parts)
+        if out is None:
+            return buffer.getvalue()
 
 
 class UIGenerator:
     """Generate React UI components"""
     
-    def __init__(self):
-        self.ai_client = AIClient()
+    def __init__(self, ai_client=None):
+        self.ai_client = ai_client or AIClient()
     
     def generate_components(self, analysis, project_id=None):
         """Generate React components based on analysis"""
@@ -163,7 +188,14 @@ class UIGenerator:
         models = analysis.get('models', [])
         styling = analysis.get('styling', {})
         
-        generated_components = {}
+        # One regex over all model names finds a component's model in a single
+        # scan; for matches at the same position the earlier model wins
+        fields_by_name = {}
+        for model in models:
+            fields_by_name.setdefault(model['name'].lower(), model['fields'])
+        model_pattern = re.compile('|'.join(map(re.escape, fields_by_name))) if fields_by_name else None
+        
+        jobs = []
         
         for component in ui_components:
             component_name = component['name']
@@ -177,22 +209,19 @@ class UIGenerator:
             
             # Find related model data if it's a data component
             data_fields = []
-            for model in models:
-                if model['name'].lower() in component_name.lower():
-                    data_fields = model['fields']
-                    break
+            match = model_pattern.search(component_name.lower()) if model_pattern else None
+            if match:
+                data_fields = fields_by_name[match.group(0)]
             
-            code = self.ai_client.generate_react_component(
+            jobs.append((component_name, dict(
                 component_name=component_name,
                 component_type=component_type,
                 description=description,
                 data_fields=data_fields,
                 project_id=project_id
-            )
-            
-            generated_components[component_name] = code
+            )))
         
-        return generated_components
+        return generate_all(self.ai_client.generate_react_component, jobs)
     
     def generate_app_structure(self, components):
         """Generate App.tsx - with or without routing based on component count"""
@@ -213,50 +242,58 @@ export default App;
         
         # Multiple components - use routing
         routes = []
+        has_root = False
         
-        for component_name in components.keys():
+        for component_name in components:
             if 'Page' in component_name or 'List' in component_name:
                 route_path = f"/{component_name.lower().replace('page', '').replace('list', '')}"
                 routes.append({
                     'path': route_path,
                     'component': component_name
                 })
+                has_root = has_root or route_path == '/'
         
         # If no routes or no root route, use first component as home
-        has_root = any(r['path'] == '/' for r in routes)
         if not has_root and components:
-            first_component = list(components.keys())[0]
+            first_component = next(iter(components))
             routes.insert(0, {
                 'path': '/',
                 'component': first_component
             })
         
-        app_code = '''import React from 'react';
-import { BrowserRouter as Router, Routes, Route } from 'react-router-dom';
-
-// Import components
-'''
+        parts = [
+            "import React from 'react';",
+            "import { BrowserRouter as Router, Routes, Route } from 'react-router-dom';",
+            "",
+            "// Import components",
+        ]
         
-        for component_name in components.keys():
-            app_code += f"import {component_name} from './components/{component_name}';\n"
+        parts.extend(
+            f"import {component_name} from './components/{component_name}';"
+            for component_name in components.keys()
+        )
         
-        app_code += '''
-function App() {
-  return (
-    <Router>
-      <Routes>
-'''
+        parts.extend([
+            "",
+            "function App() {",
+            "  return (",
+            "    <Router>",
+            "      <Routes>",
+        ])
         
-        for route in routes:
-            app_code += f"        <Route path='{route['path']}' element={{<{route['component']} />}} />\n"
+        parts.extend(
+            f"        <Route path='{route['path']}' element={{<{route['component']} />}} />"
+            for route in routes
+        )
         
-        app_code += '''      </Routes>
-    </Router>
-  );
-}
-
-export default App;
-'''
+        parts.extend([
+            "      </Routes>",
+            "    </Router>",
+            "  );",
+            "}",
+            "",
+            "export default App;",
+        ])
         
-        return app_code
+        return "\n".join(parts) + "\n"
 
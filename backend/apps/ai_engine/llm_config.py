@@ -4,14 +4,23 @@ LLM Configuration for Faibric.
 Primary: Claude Opus 4.5 for code generation
 Secondary: Best LLM per task type
 """
+import hashlib
 from enum import Enum
+from functools import cached_property
 from typing import Dict, Optional
 from dataclasses import dataclass
 
+import openai
+from django.conf import settings
+from django.core.cache import cache
+
+from .ai_client import RESPONSE_CACHE_TTL, get_anthropic_client
+
 
 class TaskType(Enum):
     """Types of AI tasks in Faibric."""
     CODE_GENERATION = "code_generation"
+    CODE_GENERATION_SIMPLE = "code_generation_simple"
     CODE_MODIFICATION = "code_modification"
     CODE_ANALYSIS = "code_analysis"
     CODE_EXPLANATION = "code_explanation"
@@ -85,6 +94,9 @@ TASK_LLM_MAP: Dict[TaskType, str] = {
     TaskType.CODE_ANALYSIS: "claude-opus-4.5",
     TaskType.CODE_DEBUG: "claude-opus-4.5",
     
+    # Templated code (e.g. serializers) - Haiku, the model only fills slots
+    TaskType.CODE_GENERATION_SIMPLE: "claude-haiku-3.5",
+    
     # Explanation - Opus for thorough explanations
     TaskType.CODE_EXPLANATION: "claude-opus-4.5",
     
@@ -99,10 +111,15 @@ TASK_LLM_MAP: Dict[TaskType, str] = {
 }
 
 
+# Resolved once at import so a task lookup is a single dict access
+_TASK_CONFIG: Dict[TaskType, LLMConfig] = {
+    task_type: LLMS[llm_name] for task_type, llm_name in TASK_LLM_MAP.items()
+}
+
+
 def get_llm_for_task(task_type: TaskType) -> LLMConfig:
     """Get the optimal LLM configuration for a task type."""
-    llm_name = TASK_LLM_MAP.get(task_type, "claude-opus-4.5")
-    return LLMS[llm_name]
+    return _TASK_CONFIG.get(task_type) or LLMS["claude-opus-4.5"]
 
 
 def get_llm_by_name(name: str) -> Optional[LLMConfig]:
@@ -115,28 +132,23 @@ class LLMClient:
     """Unified LLM client for all providers."""
     
     def __init__(self):
-        self._anthropic_client = None
-        self._openai_client = None
+        # Provider -> generate method, so `generate` doesn't re-check the provider
+        self._dispatch = {
+            "anthropic": self._generate_anthropic,
+            "openai": self._generate_openai,
+        }
     
-    @property
+    # Clients are built on first use and then read as plain attributes
+    @cached_property
     def anthropic(self):
-        if self._anthropic_client is None:
-            import anthropic
-            from django.conf import settings
-            self._anthropic_client = anthropic.Anthropic(
-                api_key=settings.ANTHROPIC_API_KEY
-            )
-        return self._anthropic_client
+        # Share AIClient's process-wide client and its connection pool
+        return get_anthropic_client()
     
-    @property
+    @cached_property
     def openai(self):
-        if self._openai_client is None:
-            import openai
-            from django.conf import settings
-            self._openai_client = openai.OpenAI(
-                api_key=settings.OPENAI_API_KEY
-            )
-        return self._openai_client
+        return openai.OpenAI(
+            api_key=settings.OPENAI_API_KEY
+        )
     
     def generate(
         self,
@@ -160,24 +172,33 @@ class LLMClient:
         """
         config = get_llm_for_task(task_type)
         
-        if config.provider == "anthropic":
-            return self._generate_anthropic(
-                config,
-                prompt,
-                system_prompt,
-                max_tokens or config.max_tokens,
-                temperature if temperature is not None else config.temperature,
-            )
-        elif config.provider == "openai":
-            return self._generate_openai(
-                config,
-                prompt,
-                system_prompt,
-                max_tokens or config.max_tokens,
-                temperature if temperature is not None else config.temperature,
-            )
-        else:
+        try:
+            handler = self._dispatch[config.provider]
+        except KeyError:
             raise ValueError(f"Unknown provider: {config.provider}")
+        
+        max_tokens = max_tokens or config.max_tokens
+        if temperature is None:
+            temperature = config.temperature
+        
+        # Only temperature 0 is deterministic enough to reuse a response;
+        # anything warmer (e.g. insights regeneration) must get a fresh answer
+        cache_key = None
+        if temperature == 0:
+            digest = hashlib.blake2b(
+                f"{config.model}|{temperature}|{max_tokens}|{system_prompt}|{prompt}".encode(),
+                digest_size=16,
+            ).hexdigest()
+            cache_key = f"llm:{digest}"
+            result = cache.get(cache_key)
+            if result is not None:
+                return result
+        
+        result = handler(config, prompt, system_prompt, max_tokens, temperature)
+        
+        if cache_key:
+            cache.set(cache_key, result, timeout=RESPONSE_CACHE_TTL)
+        return result
     
     def _generate_anthropic(
         self,
@@ -1,6 +1,7 @@
 """
 System prompts for AI generation
 """
+from string import Formatter
 
 ANALYZE_APP_PROMPT = """You are an expert software architect. Analyze the following request and determine what needs to be built.
 
@@ -142,3 +143,33 @@ User Feedback:
 Generate improved code that addresses the feedback while maintaining functionality.
 Return ONLY the code without any explanations or markdown formatting."""
 
+
+def compile_prompt(template):
+    """
+    Parse a str.format template once and return a function that renders it.
+    
+    Calls join the pre-split literal chunks with the field values instead
+    of re-parsing the template each time.
+    """
+    chunks = []
+    for literal, field, spec, conversion in Formatter().parse(template):
+        if spec or conversion:
+            raise ValueError(f"Unsupported format spec in prompt field: {field}")
+        chunks.append((literal, field))
+    
+    def render(**kwargs):
+        return "".join(
+            literal if field is None else f"{literal}{kwargs[field]}"
+            for literal, field in chunks
+        )
+    
+    return render
+
+
+render_analyze_app = compile_prompt(ANALYZE_APP_PROMPT)
+render_django_model = compile_prompt(GENERATE_DJANGO_MODEL_PROMPT)
+render_drf_serializer = compile_prompt(GENERATE_DRF_SERIALIZER_PROMPT)
+render_drf_view = compile_prompt(GENERATE_DRF_VIEW_PROMPT)
+render_react_component = compile_prompt(GENERATE_REACT_COMPONENT_PROMPT)
+render_refine_code = compile_prompt(REFINE_CODE_PROMPT)
+
@@ -4,6 +4,7 @@ Celery tasks for async AI generation
 from celery import shared_task
 from django.utils import timezone
 from django.core.cache import cache
+from apps.projects.progress import append_project_message
 from .ai_client import AIClient
 from .generators import SchemaGenerator, APIGenerator, UIGenerator
 
@@ -12,19 +13,7 @@ def broadcast_progress(project_id, step, message, progress):
     """Broadcast generation progress to Redis for real-time updates"""
     from django.utils import timezone
     
-    # Get existing messages
-    messages_key = f'project_messages_{project_id}'
-    existing = cache.get(messages_key, [])
-    
-    # Add new message to list
-    existing.append({
-        'id': f'{project_id}_{len(existing)}',
-        'type': 'action' if '✅' in message else 'thinking',
-        'content': message,
-        'timestamp': timezone.now().isoformat()
-    })
-    
-    cache.set(messages_key, existing, timeout=3600)
+    append_project_message(project_id, 'action' if '✅' in message else 'thinking', message)
     
     # Also update old progress format for compatibility
     cache.set(
@@ -53,11 +42,11 @@ def generate_app_task(self, project_id):
         
         broadcast_progress(project_id, 1, "🚀 Starting AI generation...", 5)
         
-        # Initialize generators
+        # Initialize generators, sharing one client
         ai_client = AIClient()
-        schema_gen = SchemaGenerator()
-        api_gen = APIGenerator()
-        ui_gen = UIGenerator()
+        schema_gen = SchemaGenerator(ai_client)
+        api_gen = APIGenerator(ai_client)
+        ui_gen = UIGenerator(ai_client)
         
         # Step 1: Analyze app description
         broadcast_progress(project_id, 2, "🧠 Analyzing your app description with AI...", 15)
@@ -0,0 +1,70 @@
+"""
+Tests for AIClient's response cache.
+
+Run: python manage.py test apps.ai_engine
+"""
+import hashlib
+from unittest.mock import MagicMock, patch
+
+import orjson
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from apps.ai_engine.ai_client import AIClient
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def _response(text):
+    response = MagicMock()
+    response.content = [MagicMock(text=text)]
+    response.usage.input_tokens = 1
+    response.usage.output_tokens = 1
+    return response
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class ChatCompletionCacheTest(SimpleTestCase):
+    """Test which chat completions are served from the cache."""
+    
+    def setUp(self):
+        cache.clear()
+        patcher = patch('apps.ai_engine.ai_client.get_anthropic_client')
+        self.addCleanup(patcher.stop)
+        self.create = patcher.start().return_value.messages.create
+        self.create.return_value = _response('class Todo: pass')
+        self.client = AIClient()
+    
+    def complete(self, content='Generate a model', temperature=0):
+        return self.client.chat_completion(
+            messages=[
+                {'role': 'system', 'content': 'You are an expert Django developer.'},
+                {'role': 'user', 'content': content},
+            ],
+            temperature=temperature,
+        )
+    
+    def test_temperature_zero_is_cached(self):
+        """Identical temperature-0 requests call the API once."""
+        self.assertEqual(self.complete(), 'class Todo: pass')
+        self.assertEqual(self.complete(), 'class Todo: pass')
+        self.assertEqual(self.create.call_count, 1)
+    
+    def test_cache_key_is_digest_of_request(self):
+        """The cache key is a SHA-256 of the request sent to the API."""
+        self.complete()
+        kwargs = self.create.call_args.kwargs
+        digest = hashlib.sha256(orjson.dumps(kwargs, option=orjson.OPT_SORT_KEYS)).hexdigest()
+        self.assertEqual(cache.get(f'claude:{digest}'), 'class Todo: pass')
+    
+    def test_different_prompts_are_not_shared(self):
+        """A different prompt misses the cache."""
+        self.complete('Generate a model')
+        self.complete('Generate a serializer')
+        self.assertEqual(self.create.call_count, 2)
+    
+    def test_nonzero_temperature_is_not_cached(self):
+        """Warmer requests always reach the API, so retries get a fresh answer."""
+        self.complete(temperature=0.5)
+        self.complete(temperature=0.5)
+        self.assertEqual(self.create.call_count, 2)
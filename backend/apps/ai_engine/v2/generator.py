@@ -6,10 +6,8 @@ import json
 import re
 import logging
 from typing import Generator, Dict, Any, Optional, List
-import anthropic
-from django.conf import settings
-from django.core.cache import cache
-from django.utils import timezone
+from apps.projects.progress import append_project_message
+from ..ai_client import get_anthropic_client
 from .prompts import CLASSIFY_PROMPT, MODIFY_PROMPT, get_prompt_for_type
 
 logger = logging.getLogger(__name__)
@@ -134,7 +132,7 @@ class AIGeneratorV2(CodeLibraryMixin):
     CHEAP_MODEL = "claude-3-5-haiku-20241022"     # Haiku - for everything else
     
     def __init__(self, model: str = None):
-        self.client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
+        self.client = get_anthropic_client()
         self.model = model or self.EXPENSIVE_MODEL
         self.session_token = None  # Set by caller for cost tracking
     
@@ -299,18 +297,17 @@ CRITICAL RULES:
                         if snippet:
                             self._add_session_event(session, snippet)
                         last_update_len = len(full_response)
+                
+                usage = stream.get_final_message().usage
             
             result_text = full_response
             self._add_session_event(session, f"Generated {len(result_text)} characters")
             
-            # Track API usage (estimate tokens from character count)
-            # Roughly 4 chars per token for code
-            estimated_input_tokens = len(full_prompt) // 4
-            estimated_output_tokens = len(result_text) // 4
+            # Track API usage from the final streamed message
             self._track_usage(
                 model=generation_model,
-                input_tokens=estimated_input_tokens,
-                output_tokens=estimated_output_tokens,
+                input_tokens=usage.input_tokens,
+                output_tokens=usage.output_tokens,
                 task_type='generate_new' if not has_library_match else 'reuse',
                 success=True,
             )
@@ -525,17 +522,7 @@ export default App;"""
             return
         
         try:
-            messages_key = f'project_messages_{project_id}'
-            existing = cache.get(messages_key, []) or []
-            
-            existing.append({
-                'id': f'{project_id}_{len(existing)}',
-                'type': msg_type,
-                'content': content,
-                'timestamp': timezone.now().isoformat()
-            })
-            
-            cache.set(messages_key, existing, timeout=3600)
+            append_project_message(project_id, msg_type, content)
         except Exception as e:
             # Redis failure is non-critical - just log and continue
             print(f"Redis broadcast failed: {e}")
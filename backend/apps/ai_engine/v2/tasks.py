@@ -2,24 +2,13 @@
 V2 Celery tasks - Faster generation with single-shot AI
 """
 from celery import shared_task
-from django.utils import timezone
-from django.core.cache import cache
+from apps.projects.progress import append_project_message
 from .generator import AIGeneratorV2
 
 
 def broadcast_progress(project_id, msg_type, message):
     """Broadcast generation progress to Redis"""
-    messages_key = f'project_messages_{project_id}'
-    existing = cache.get(messages_key, [])
-    
-    existing.append({
-        'id': f'{project_id}_{len(existing)}',
-        'type': msg_type,
-        'content': message,
-        'timestamp': timezone.now().isoformat()
-    })
-    
-    cache.set(messages_key, existing, timeout=3600)
+    append_project_message(project_id, msg_type, message)
 
 
 @shared_task(bind=True, max_retries=2)
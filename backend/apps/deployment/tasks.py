@@ -9,18 +9,9 @@ from django.conf import settings
 
 def broadcast_deploy_message(project_id, content):
     """Helper to broadcast deployment messages"""
-    from django.core.cache import cache
-    
-    messages_key = f'project_messages_{project_id}'
-    existing = cache.get(messages_key, [])
+    from apps.projects.progress import append_project_message
     
-    existing.append({
-        'id': f'{project_id}_deploy_{len(existing)}',
-        'type': 'action',
-        'content': content,
-        'timestamp': timezone.now().isoformat()
-    })
-    cache.set(messages_key, existing, timeout=3600)
+    append_project_message(project_id, 'action', content, id_prefix='deploy_')
 
 
 def use_render_deployer():
@@ -0,0 +1,83 @@
+"""
+Per-project message history shown on the live creation screen
+"""
+import json
+from functools import lru_cache
+
+import redis
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+MESSAGES_TTL = 3600
+# Only the most recent messages are kept, so the history can't grow without bound
+MESSAGES_LIMIT = 200
+
+
+@lru_cache(maxsize=None)
+def _redis_client(url):
+    """Process-wide Redis client for `url`; connections open on first use."""
+    return redis.Redis.from_url(url)
+
+
+def _redis():
+    """Redis client for the default cache's server, or None when it isn't Redis."""
+    config = settings.CACHES['default']
+    if config['BACKEND'] != 'django.core.cache.backends.redis.RedisCache':
+        return None
+    # Like RedisCache, write to the first of several configured servers
+    location = config['LOCATION']
+    if isinstance(location, str):
+        location = location.split(',')
+    return _redis_client(location[0].strip())
+
+
+def _message(msg_id, msg_type, content):
+    return {
+        'id': msg_id,
+        'type': msg_type,
+        'content': content,
+        'timestamp': timezone.now().isoformat(),
+    }
+
+
+def append_project_message(project_id, msg_type, content, id_prefix=''):
+    """
+    Append a message to the project's history.
+
+    On Redis the history is a list, so an append is an RPUSH of one entry
+    instead of re-reading and re-writing the whole history, and concurrent
+    writers (Celery tasks, the API) can't drop each other's messages.
+    """
+    name = f'project_messages_{project_id}'
+    key = cache.make_and_validate_key(name)
+    conn = _redis()
+    if conn is None:
+        cache.add(f'{name}_seq', 0, timeout=MESSAGES_TTL)
+        seq = cache.incr(f'{name}_seq') - 1
+        existing = cache.get(name, [])
+        message = _message(f'{project_id}_{id_prefix}{seq}', msg_type, content)
+        existing.append(message)
+        cache.set(name, existing[-MESSAGES_LIMIT:], timeout=MESSAGES_TTL)
+        return message
+    
+    # Message ids come from a counter so they stay unique for the frontend
+    list_key, seq_key = f'{key}:list', f'{key}:seq'
+    message = _message(f'{project_id}_{id_prefix}{conn.incr(seq_key) - 1}', msg_type, content)
+    pipe = conn.pipeline()
+    pipe.rpush(list_key, json.dumps(message))
+    pipe.ltrim(list_key, -MESSAGES_LIMIT, -1)
+    pipe.expire(list_key, MESSAGES_TTL)
+    pipe.expire(seq_key, MESSAGES_TTL)
+    pipe.execute()
+    return message
+
+
+def get_project_messages(project_id):
+    """Return the project's message history, oldest first."""
+    name = f'project_messages_{project_id}'
+    key = cache.make_and_validate_key(name)
+    conn = _redis()
+    if conn is None:
+        return cache.get(name, [])
+    return [json.loads(raw) for raw in conn.lrange(f'{key}:list', 0, -1)]
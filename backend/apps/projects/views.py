@@ -4,6 +4,7 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
 from .models import Project, ProjectVersion
+from .progress import append_project_message, get_project_messages
 from .serializers import (
     ProjectSerializer, ProjectListSerializer, 
     ProjectCreateSerializer, ProjectVersionSerializer
@@ -74,8 +75,6 @@ class ProjectViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['post'])
     def regenerate(self, request, pk=None):
         """Regenerate project with updated prompt using V2 generator"""
-        from django.core.cache import cache
-        from django.utils import timezone
         from apps.projects.models import GeneratedModel, GeneratedAPI
         from apps.ai_engine.v3.tasks import generate_app_v3_task
         
@@ -84,16 +83,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
         new_prompt = request.data.get('user_prompt')
         if new_prompt:
             # Broadcast user message
-            messages_key = f'project_messages_{project.id}'
-            existing_messages = cache.get(messages_key, [])
-            
-            existing_messages.append({
-                'id': f'{project.id}_user_{len(existing_messages)}',
-                'type': 'action',
-                'content': f'💬 You: {new_prompt}',
-                'timestamp': timezone.now().isoformat()
-            })
-            cache.set(messages_key, existing_messages, timeout=3600)
+            append_project_message(project.id, 'action', f'💬 You: {new_prompt}', id_prefix='user_')
             
             # Delete old generated models/APIs
             GeneratedModel.objects.filter(project=project).delete()
@@ -159,7 +149,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
         from django.core.cache import cache
         
         # Get message history
-        messages = cache.get(f'project_messages_{pk}', [])
+        messages = get_project_messages(pk)
         progress_data = cache.get(f'project_progress_{pk}')
         
         # Calculate progress based on project status
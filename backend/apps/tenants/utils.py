@@ -1,6 +1,7 @@
 import secrets
 from datetime import timedelta
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.utils.text import slugify
 
 from .middleware import get_current_tenant, get_current_user
@@ -172,3 +173,14 @@ class TenantModelMixin:
                 self.tenant = tenant
         super().save(*args, **kwargs)
 
+
+class TenantScopedMixin:
+    """
+    Mixin for views scoped to the request's tenant.
+    Resolves `request.tenant` once per request; use after permission checks,
+    since TenantPermission may set it during has_permission.
+    """
+    
+    @cached_property
+    def tenant(self):
+        return getattr(self.request, 'tenant', None)
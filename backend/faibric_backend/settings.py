@@ -281,6 +281,11 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
+# AI generation tasks spend minutes waiting on the Anthropic API, so they get
+# their own queue and can't hold up deploys, reports and other jobs
+CELERY_TASK_ROUTES = {
+    'apps.ai_engine.*': {'queue': 'ai_generation'},
+}
 
 # LLM Configuration
 # Primary: Anthropic Claude Opus 4.5 for code generation